@@ -1,2 +1,4 @@
 from .vigenere import vigenere_main
+from .vigenere_batch import crack_many
+from .vigenere_incremental import IncrementalVigenereCracker
 from .feistel import feistel_main
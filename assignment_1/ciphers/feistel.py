@@ -1,14 +1,58 @@
 import random
+import secrets
 import string
 import sys
-from typing import Tuple
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Iterable, Iterator, Tuple
 import numpy as np
-from .utils import file_handler, output_for_file
+from .utils import (
+    file_handler,
+    output_for_file,
+    output_for_file_around_text,
+    read_in_chunks,
+    TRANSLITERATE_ERROR_HANDLER,
+)
+from warnings import warn
+
+WORD_BITS = 64
+SUBKEY_CHUNK_BITS = 1 << 20
+ROUND_MAP_PERIOD = 3
+COMPILED_NETWORK_CACHE_SIZE = 8
+BLOCK_MODES = ("ecb", "ctr")
+BLOCK_SIZES = (64, 128)
+DEFAULT_BLOCK_SIZE = 64
+MIN_BLOCKS_PER_WORKER = 1 << 10
+
+
+def text_to_bytes(text: str) -> np.ndarray:
+    """
+    Convert text to bytes, one byte per character. Characters past U+00FF have
+    no single byte, so they are transliterated to ascii with a warning, the way
+    vigenere replaces non-ascii characters.
+
+    Args:
+        text: Text to convert.
+
+    Returns:
+        ndarray: Bytes of text as uint8.
+    """
+    try:
+        return np.frombuffer(text.encode("latin-1"), dtype=np.uint8)
+    except UnicodeEncodeError:
+        warn(
+            "Character past U+00FF detected. Feistel cipher codes one byte per "
+            "character, so these characters will be replaced with an alike "
+            "representation and will not decode to the original text.",
+        )
+        return np.frombuffer(
+            text.encode("latin-1", errors=TRANSLITERATE_ERROR_HANDLER), dtype=np.uint8
+        )
 
 
 def text_to_binary(text: str) -> np.ndarray:
     """
-    Convert text to binary.
+    Convert text to binary, one byte per character as text_to_bytes gives.
 
     Args:
         text: Text to convert.
@@ -16,9 +60,7 @@ def text_to_binary(text: str) -> np.ndarray:
     Returns:
         ndarray: Binary representation of text.
     """
-    return np.array(
-        [bit for bit in "".join(format(ord(c), "08b") for c in text)]
-    ).astype(np.uint8)
+    return np.unpackbits(text_to_bytes(text))
 
 
 def binary_to_text(binary: np.ndarray) -> str:
@@ -31,11 +73,7 @@ def binary_to_text(binary: np.ndarray) -> str:
     Returns:
         str: Text representation of binary.
     """
-    binary = binary.astype(str)
-
-    return "".join(
-        chr(int(f"0b{''.join(binary[i : i + 8])}", 2)) for i in range(0, len(binary), 8)
-    )
+    return np.packbits(np.asarray(binary, dtype=np.uint8)).tobytes().decode("latin-1")
 
 
 def generate_subkeys(secret_key: int, length: int, num_blocks: int) -> np.ndarray:
@@ -55,6 +93,105 @@ def generate_subkeys(secret_key: int, length: int, num_blocks: int) -> np.ndarra
     )
 
 
+def pack_bits(binary: np.ndarray) -> np.ndarray:
+    """
+    Pack bits into uint64 words along the last axis, padding with zero bits to
+    a whole number of words.
+
+    Args:
+        binary: Bits to pack.
+
+    Returns:
+        ndarray: Packed bits.
+    """
+    packed_bytes = np.packbits(binary, axis=-1)
+    padding = -packed_bytes.shape[-1] % (WORD_BITS // 8)
+    packed_bytes = np.pad(
+        packed_bytes, [(0, 0)] * (packed_bytes.ndim - 1) + [(0, padding)]
+    )
+    return np.ascontiguousarray(packed_bytes).view(np.uint64)
+
+
+def pack_bytes(data: np.ndarray) -> np.ndarray:
+    """
+    Pack bytes into uint64 words along the last axis, the same way pack_bits
+    packs the bits of those bytes.
+
+    Args:
+        data: Bytes to pack as uint8.
+
+    Returns:
+        ndarray: Packed bytes.
+    """
+    padding = -data.shape[-1] % (WORD_BITS // 8)
+    return np.ascontiguousarray(
+        np.pad(data, [(0, 0)] * (data.ndim - 1) + [(0, padding)])
+    ).view(np.uint64)
+
+
+def unpack_bytes(words: np.ndarray, length: int) -> np.ndarray:
+    """
+    Unpack uint64 words from pack_bytes back into bytes along the last axis.
+
+    Args:
+        words: Packed bytes.
+        length: Number of bytes before padding.
+
+    Returns:
+        ndarray: Bytes as uint8.
+    """
+    return words.view(np.uint8)[..., :length]
+
+
+def unpack_bits(words: np.ndarray, length: int) -> np.ndarray:
+    """
+    Unpack uint64 words from pack_bits back into bits along the last axis.
+
+    Args:
+        words: Packed bits.
+        length: Number of bits before padding.
+
+    Returns:
+        ndarray: Bits.
+    """
+    return np.unpackbits(words.view(np.uint8), axis=-1)[..., :length]
+
+
+def generate_packed_subkeys(
+    secret_key: int, length: int, num_blocks: int
+) -> np.ndarray:
+    """
+    Generate the subkeys of generate_subkeys packed into uint64 words. When
+    length is a multiple of 4 the generator draws whole 32 bit values per row,
+    so the subkeys can be drawn and packed a few rows at a time without ever
+    holding them all unpacked. This relies on numpy's Generator giving the same
+    stream whether the bits are drawn in one call or in pieces, which NumPy does
+    not document, so the tests check it across several chunks.
+
+    Args:
+        secret_key: Secret key.
+        length: Length of subkey.
+        num_blocks: Number of subkeys.
+
+    Returns:
+        ndarray: Packed subkeys.
+    """
+    if length % 4:
+        return pack_bits(generate_subkeys(secret_key, length, num_blocks))
+
+    rng = np.random.default_rng(secret_key)
+    rows_per_chunk = max(SUBKEY_CHUNK_BITS // max(length, 1), 1)
+    packed_subkeys = np.empty((num_blocks, -(-length // WORD_BITS)), dtype=np.uint64)
+
+    for start in range(0, num_blocks, rows_per_chunk):
+        rows = min(rows_per_chunk, num_blocks - start)
+        packed_subkeys[start : start + rows] = pack_bits(
+            rng.integers(2, size=(rows, length), dtype=np.uint8)
+        )
+
+    return packed_subkeys
+
+
 def generate_new_feistel_block(
     left: np.ndarray,
     right: np.ndarray,
@@ -95,23 +232,482 @@ def perform_feistel_coding(
     return np.concatenate((right, left))
 
 
-def feistel_main(
-    text: str,
+def perform_packed_feistel_coding(
+    text_as_binary: np.ndarray, packed_subkeys: np.ndarray
+) -> np.ndarray:
+    """
+    Perform feistel coding with both halves and the subkeys packed into uint64
+    words, giving the same bits as perform_feistel_coding.
+
+    Args:
+        text_as_binary: Text to encode.
+        packed_subkeys: Subkeys from generate_packed_subkeys.
+
+    Returns:
+        ndarray: Encoded text.
+    """
+    half_length = text_as_binary.size // 2
+    left, right = pack_bits(np.split(text_as_binary, 2))
+
+    for subkey in packed_subkeys:
+        left, right = generate_new_feistel_block(left, right, subkey)
+
+    return np.concatenate(
+        (unpack_bits(right, half_length), unpack_bits(left, half_length))
+    )
+
+
+def apply_linear_rounds(
+    left: np.ndarray, right: np.ndarray, num_rounds: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Apply num_rounds rounds of generate_new_feistel_block with all zero subkeys.
+    Over GF(2) a round maps (left, right) to (right, left ^ right), a linear map
+    that is the identity after ROUND_MAP_PERIOD rounds.
+
+    Args:
+        left: Left part of feistel block.
+        right: Right part of feistel block.
+        num_rounds: Number of rounds.
+
+    Returns:
+        Tuple[ndarray, ndarray]: New feistel block split into new left and right blocks.
+    """
+    num_rounds %= ROUND_MAP_PERIOD
+
+    if num_rounds == 1:
+        return right, np.bitwise_xor(left, right)
+    if num_rounds == 2:
+        return np.bitwise_xor(left, right), left
+
+    return left, right
+
+
+class CompiledFeistelNetwork:
+    """
+    A feistel network compiled into a fixed linear map of the halves plus a
+    constant mask for each half. As generate_new_feistel_block only XORs, any
+    number of rounds equals apply_linear_rounds followed by XOR with the
+    halves the network gives for an all zero block, so coding costs the same
+    whatever the number of rounds.
+    """
+
+    def __init__(self, packed_subkeys: np.ndarray) -> None:
+        """
+        Args:
+            packed_subkeys: Subkeys from generate_packed_subkeys.
+        """
+        self.num_rounds = len(packed_subkeys)
+        self.encode_masks = self.find_masks(packed_subkeys)
+        self.decode_masks = self.find_masks(packed_subkeys[::-1])
+
+    @staticmethod
+    def find_masks(packed_subkeys: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find the halves the rounds give for an all zero block.
+
+        Args:
+            packed_subkeys: Subkeys in the order the rounds use them.
+
+        Returns:
+            Tuple[ndarray, ndarray]: The left and right masks.
+        """
+        left = right = np.zeros(packed_subkeys.shape[1:], dtype=np.uint64)
+
+        for subkey in packed_subkeys:
+            left, right = generate_new_feistel_block(left, right, subkey)
+
+        return left, right
+
+    def code(self, text_as_binary: np.ndarray, decode: bool = False) -> np.ndarray:
+        """
+        Perform feistel coding, giving the same bits as perform_feistel_coding.
+
+        Args:
+            text_as_binary: Text to encode or decode.
+            decode: Run the rounds with the subkeys in reverse to decode.
+
+        Returns:
+            ndarray: Encoded or decoded text.
+        """
+        half_length = text_as_binary.size // 2
+        left_mask, right_mask = self.decode_masks if decode else self.encode_masks
+        left, right = apply_linear_rounds(
+            *pack_bits(np.split(text_as_binary, 2)), self.num_rounds
+        )
+
+        return np.concatenate(
+            (
+                unpack_bits(np.bitwise_xor(right, right_mask), half_length),
+                unpack_bits(np.bitwise_xor(left, left_mask), half_length),
+            )
+        )
+
+    def code_blocks(
+        self, blocks: np.ndarray, decode: bool = False, workers: int = 1
+    ) -> np.ndarray:
+        """
+        Perform feistel coding on every row of a matrix of bytes at once, each
+        row coded as code would code its bits. With more than one worker the
+        rows are split between threads, as the blocks are independent and NumPy
+        releases the GIL while it XORs them.
+
+        Args:
+            blocks: A (number of blocks, block size in bytes) matrix of uint8.
+            decode: Run the rounds with the subkeys in reverse to decode.
+            workers: Number of threads, each given at least MIN_BLOCKS_PER_WORKER rows.
+
+        Returns:
+            ndarray: The coded blocks.
+        """
+        num_parts = min(workers, -(-blocks.shape[0] // MIN_BLOCKS_PER_WORKER))
+
+        if num_parts > 1:
+            with ThreadPoolExecutor(max_workers=num_parts) as executor:
+                return np.concatenate(
+                    list(
+                        executor.map(
+                            lambda part: self.code_blocks(part, decode=decode),
+                            np.array_split(blocks, num_parts),
+                        )
+                    )
+                )
+
+        half_bytes = blocks.shape[1] // 2
+        left_mask, right_mask = self.decode_masks if decode else self.encode_masks
+        left, right = apply_linear_rounds(
+            *(
+                pack_bytes(half)
+                for half in (blocks[:, :half_bytes], blocks[:, half_bytes:])
+            ),
+            self.num_rounds,
+        )
+
+        return np.concatenate(
+            (
+                unpack_bytes(np.bitwise_xor(right, right_mask), half_bytes),
+                unpack_bytes(np.bitwise_xor(left, left_mask), half_bytes),
+            ),
+            axis=1,
+        )
+
+
+@lru_cache(maxsize=COMPILED_NETWORK_CACHE_SIZE)
+def compile_feistel_network(
+    secret_key: int, length: int, num_blocks: int
+) -> CompiledFeistelNetwork:
+    """
+    Compile the feistel network for a key, reusing it for repeated calls.
+
+    Args:
+        secret_key: Secret key.
+        length: Length of subkey.
+        num_blocks: Number of subkeys.
+
+    Returns:
+        CompiledFeistelNetwork: The compiled network.
+    """
+    return CompiledFeistelNetwork(
+        generate_packed_subkeys(secret_key, length, num_blocks)
+    )
+
+
+def pad_block_bytes(data: np.ndarray, block_bytes: int) -> np.ndarray:
+    """
+    Pad bytes to a whole number of blocks with PKCS#7 padding, adding a full
+    block of padding when the bytes already fill their last block.
+
+    Args:
+        data: Bytes to pad as uint8.
+        block_bytes: Block size in bytes.
+
+    Returns:
+        ndarray: Padded bytes.
+    """
+    padding = block_bytes - data.size % block_bytes
+    return np.concatenate((data, np.full(padding, padding, dtype=np.uint8)))
+
+
+def unpad_block_bytes(data: np.ndarray, block_bytes: int) -> np.ndarray:
+    """
+    Remove the PKCS#7 padding from pad_block_bytes.
+
+    Args:
+        data: Padded bytes as uint8.
+        block_bytes: Block size in bytes.
+
+    Returns:
+        ndarray: Bytes without padding.
+    """
+    padding = int(data[-1]) if data.size else 0
+
+    if (
+        data.size % block_bytes
+        or not 0 < padding <= block_bytes
+        or np.any(data[-padding:] != padding)
+    ):
+        raise ValueError("Invalid padding, the key or block settings may be wrong")
+
+    return data[:-padding]
+
+
+def counter_blocks(nonce: np.ndarray, block_count: int, start: int = 0) -> np.ndarray:
+    """
+    Build the counter blocks for counter mode, each the nonce followed by the
+    big endian block number.
+
+    Args:
+        nonce: Nonce filling the first half of every block as uint8.
+        block_count: Number of blocks.
+        start: Number of the first block.
+
+    Returns:
+        ndarray: A (block_count, 2 * nonce size) matrix of uint8.
+    """
+    if start + block_count > 256**nonce.size:
+        # the counter would wrap around and repeat the keystream
+        raise ValueError("Too many blocks for the counter of this block size")
+
+    counters = np.arange(start, start + block_count, dtype=">u8").view(np.uint8)
+    return np.concatenate(
+        (
+            np.broadcast_to(nonce, (block_count, nonce.size)),
+            counters.reshape(block_count, 8)[:, 8 - nonce.size :],
+        ),
+        axis=1,
+    )
+
+
+def perform_block_feistel_coding(
+    data: np.ndarray,
+    network: CompiledFeistelNetwork,
+    block_mode: str,
+    block_size: int,
+    decode: bool,
+    workers: int = 1,
+) -> np.ndarray:
+    """
+    Perform feistel coding block by block with a network compiled for one block.
+    In ecb mode every block is coded on its own after PKCS#7 padding. In ctr
+    mode the bytes are XORed with the encoded counter blocks, with the nonce
+    written before the encoded bytes.
+
+    Args:
+        data: Bytes to encode or decode as uint8.
+        network: Network compiled for half of block_size.
+        block_mode: One of BLOCK_MODES.
+        block_size: Block size in bits.
+        decode: Decode or encode.
+        workers: Number of threads to code the blocks with.
+
+    Returns:
+        ndarray: Coded bytes as uint8.
+    """
+    block_bytes = block_size // 8
+
+    if block_mode == "ecb":
+        if not (decode):
+            data = pad_block_bytes(data, block_bytes)
+        elif data.size % block_bytes:
+            raise ValueError("Encoded text is not a whole number of blocks")
+
+        coded = network.code_blocks(
+            data.reshape(-1, block_bytes), decode=decode, workers=workers
+        )
+        coded = coded.reshape(-1)
+
+        return unpad_block_bytes(coded, block_bytes) if decode else coded
+
+    nonce_bytes = block_bytes // 2
+
+    if decode:
+        if data.size < nonce_bytes:
+            raise ValueError("Encoded text is too short to hold the nonce")
+        nonce, data = data[:nonce_bytes], data[nonce_bytes:]
+    else:
+        nonce = np.frombuffer(secrets.token_bytes(nonce_bytes), dtype=np.uint8)
+
+    keystream = network.code_blocks(
+        counter_blocks(nonce, -(-data.size // block_bytes)), workers=workers
+    ).reshape(-1)
+    coded = np.bitwise_xor(data, keystream[: data.size])
+
+    return coded if decode else np.concatenate((nonce, coded))
+
+
+def stream_block_feistel_coding(
+    data_chunks: Iterable[np.ndarray],
+    network: CompiledFeistelNetwork,
+    block_mode: str,
+    block_size: int,
+    decode: bool,
+    workers: int = 1,
+) -> Iterator[np.ndarray]:
+    """
+    Perform block feistel coding on bytes arriving in chunks, giving the same
+    bytes as perform_block_feistel_coding would for the whole data at once.
+    Bytes short of a whole block are carried over to the next chunk, and the
+    last block is padded in ecb mode or coded with part of its keystream in ctr
+    mode once the chunks run out.
+
+    Args:
+        data_chunks: Bytes to encode or decode as uint8 in chunks.
+        network: Network compiled for half of block_size.
+        block_mode: One of BLOCK_MODES.
+        block_size: Block size in bits.
+        decode: Decode or encode.
+        workers: Number of threads to code the blocks with.
+
+    Returns:
+        Iterator[ndarray]: Coded bytes as uint8 in chunks.
+    """
+    block_bytes = block_size // 8
+    nonce_bytes = block_bytes // 2
+    carried = np.empty(0, dtype=np.uint8)
+    nonce = None
+    blocks_coded = 0
+
+    if block_mode == "ctr" and not (decode):
+        nonce = np.frombuffer(secrets.token_bytes(nonce_bytes), dtype=np.uint8)
+        yield nonce
+
+    def code_whole_blocks(data: np.ndarray) -> np.ndarray:
+        if block_mode == "ecb":
+            return network.code_blocks(
+                data.reshape(-1, block_bytes), decode=decode, workers=workers
+            ).reshape(-1)
+
+        keystream = network.code_blocks(
+            counter_blocks(nonce, -(-data.size // block_bytes), blocks_coded),
+            workers=workers,
+        ).reshape(-1)
+        return np.bitwise_xor(data, keystream[: data.size])
+
+    for data_chunk in data_chunks:
+        data = np.concatenate((carried, data_chunk))
+
+        if nonce is None and block_mode == "ctr":
+            if data.size < nonce_bytes:
+                carried = data
+                continue
+            nonce, data = data[:nonce_bytes], data[nonce_bytes:]
+
+        # in ecb decode mode the last block is held back to remove its padding
+        held_back = int(block_mode == "ecb" and decode and data.size > 0)
+        whole_blocks = (data.size - held_back) // block_bytes
+        carried = data[whole_blocks * block_bytes :]
+
+        if whole_blocks:
+            yield code_whole_blocks(data[: whole_blocks * block_bytes])
+            blocks_coded += whole_blocks
+
+    if block_mode == "ecb":
+        if not (decode):
+            yield code_whole_blocks(pad_block_bytes(carried, block_bytes))
+        elif carried.size != block_bytes:
+            raise ValueError("Encoded text is not a whole number of blocks")
+        else:
+            yield unpad_block_bytes(code_whole_blocks(carried), block_bytes)
+    elif nonce is None:
+        raise ValueError("Encoded text is too short to hold the nonce")
+    elif carried.size:
+        yield code_whole_blocks(carried)
+
+
+def feistel_stream_main(
+    ifile: str,
     ofile: str,
+    key: str,
+    network: CompiledFeistelNetwork,
+    decode: bool,
+    block_mode: str,
+    block_size: int,
+    chunk_size: int,
+    workers: int = 1,
+) -> None:
+    """
+    Encode or decode a file in block mode chunk by chunk, so memory use is
+    bounded by the chunk size rather than the file size.
+
+    Args:
+        ifile: Input file.
+        ofile: Output file.
+        key: Secret key.
+        network: Network compiled for half of block_size.
+        decode: Decode or encode.
+        block_mode: One of BLOCK_MODES.
+        block_size: Block size in bits.
+        chunk_size: Number of characters to read at a time.
+        workers: Number of threads to code the blocks with.
+
+    Returns:
+        None: None.
+    """
+    before_text, after_text = output_for_file_around_text(
+        cipher="FEISTEL",
+        key=key,
+        mode="DECODED" if decode else "ENCODED",
+    )
+
+    def write_output(output_file) -> None:
+        output_file.write(before_text)
+        file_handler(
+            path=ifile,
+            mode="r",
+            func=lambda input_file: output_file.writelines(
+                coded_chunk.tobytes().decode("latin-1")
+                for coded_chunk in stream_block_feistel_coding(
+                    data_chunks=(
+                        text_to_bytes(text_chunk)
+                        for text_chunk in read_in_chunks(input_file, chunk_size)
+                    ),
+                    network=network,
+                    block_mode=block_mode,
+                    block_size=block_size,
+                    decode=decode,
+                    workers=workers,
+                )
+            ),
+            newline="",
+        )
+        output_file.write(after_text)
+
+    if ofile:
+        file_handler(path=ofile, mode="w", func=write_output, newline="")
+    else:
+        write_output(sys.stdout)
+        sys.stdout.write("\n")
+
+
+def feistel_main(
+    text: str = None,
+    ofile: str = None,
     key: str = None,
     decode: bool = True,
     num_blocks: int = 4,
+    block_mode: str = None,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+    workers: int = 1,
+    ifile: str = None,
+    chunk_size: int = None,
     **kwargs,
 ) -> None:
     """
     Main function for feistel cipher.
 
     Args:
-        text: Text to encode/decode.
+        text: Text to encode/decode, or None when streaming ifile.
         ofile: Output file.
         key: Secret key.
         decode: Decode or encode.
         num_blocks: Number of blocks.
+        block_mode: One of BLOCK_MODES to code fixed size blocks with one small
+        subkey schedule, or None to code the whole text as one block.
+        block_size: Block size in bits for block_mode, one of BLOCK_SIZES.
+        workers: Number of threads to code the blocks of block_mode with.
+        ifile: Input file, read in chunks when chunk_size is given.
+        chunk_size: Stream ifile in chunks of this many characters, which needs
+        a block_mode.
         kwargs: Keyword arguments.
 
     Returns:
@@ -131,30 +727,59 @@ def feistel_main(
             f"-----END FEISTEL KEY-----\n\n"
         )
 
-    text_as_binary = text_to_binary(text)
-
-    subkeys = generate_subkeys(
-        int.from_bytes(key.encode(), byteorder=sys.byteorder),
-        text_as_binary.size // 2,
-        num_blocks,
-    )
+    secret_key = int.from_bytes(key.encode(), byteorder=sys.byteorder)
 
     if decode:
-        subkeys = np.flip(subkeys, axis=0)
         mode_as_word = "DECODED"
     else:
         mode_as_word = "ENCODED"
 
-    text = binary_to_text(perform_feistel_coding(text_as_binary, subkeys))
+    if chunk_size is not None:
+        if block_mode is None:
+            raise ValueError("Streaming mode for feistel cipher needs a block mode")
+
+        return feistel_stream_main(
+            ifile=ifile,
+            ofile=ofile,
+            key=key,
+            network=compile_feistel_network(secret_key, block_size // 2, num_blocks),
+            decode=decode,
+            block_mode=block_mode,
+            block_size=block_size,
+            chunk_size=chunk_size,
+            workers=workers,
+        )
+
+    if block_mode is not None:
+        coded_text = (
+            perform_block_feistel_coding(
+                data=text_to_bytes(text),
+                network=compile_feistel_network(
+                    secret_key, block_size // 2, num_blocks
+                ),
+                block_mode=block_mode,
+                block_size=block_size,
+                decode=decode,
+                workers=workers,
+            )
+            .tobytes()
+            .decode("latin-1")
+        )
+    else:
+        text_as_binary = text_to_binary(text)
+        network = compile_feistel_network(
+            secret_key, text_as_binary.size // 2, num_blocks
+        )
+        coded_text = binary_to_text(network.code(text_as_binary, decode=decode))
 
     output = output_for_file.format(
         cipher="FEISTEL",
         key=key,
         mode=mode_as_word,
-        text=binary_to_text(perform_feistel_coding(text_as_binary, subkeys)),
+        text=coded_text,
     )
 
     if ofile:
-        file_handler(path=ofile, mode="w", func=lambda f: f.write(output))
+        file_handler(path=ofile, mode="w", func=lambda f: f.write(output), newline="")
     else:
         print(output)
@@ -0,0 +1,123 @@
+import hashlib
+import json
+import os
+from typing import List, Optional, Tuple
+import numpy as np
+from .utils import file_handler
+
+DEFAULT_CACHE_SIZE = 1024
+CACHE_ENTRY_EXTENSION = ".json"
+
+
+def cache_entry_path(cache_dir: str, letters: np.ndarray) -> str:
+    """
+    Return the path of the cache entry for some letters.
+
+    Args:
+        cache_dir (str): The directory holding the cache.
+        letters (np.ndarray): The letters as positions in alphabet.
+
+    Returns:
+        str: The path of the cache entry, named by a hash of the letters.
+    """
+    letters_hash = hashlib.sha256(
+        np.ascontiguousarray(letters, dtype=np.uint8).tobytes()
+    ).hexdigest()
+    return os.path.join(cache_dir, letters_hash + CACHE_ENTRY_EXTENSION)
+
+
+def load_cached_key(
+    cache_dir: str, letters: np.ndarray, engine_version: str
+) -> Optional[Tuple[List[int], float]]:
+    """
+    Load the key cracked for some letters, marking the entry as recently used.
+
+    Args:
+        cache_dir (str): The directory holding the cache.
+        letters (np.ndarray): The letters as positions in alphabet.
+        engine_version (str): The version of the engine the key must come from.
+
+    Returns:
+        Optional[Tuple[List[int], float]]: The key and its chi squared value, or
+        None if there is no entry from this engine version.
+    """
+    path = cache_entry_path(cache_dir=cache_dir, letters=letters)
+
+    try:
+        entry = file_handler(path=path, mode="r", func=json.load)
+    except (OSError, ValueError):
+        return None
+
+    if not entry or entry.get("engine_version") != engine_version:
+        return None
+
+    os.utime(path)
+    return entry["key"], entry["chi_squared"]
+
+
+def evict_least_recently_used(cache_dir: str, cache_size: int) -> None:
+    """
+    Remove the least recently used entries until at most cache_size remain.
+
+    Args:
+        cache_dir (str): The directory holding the cache.
+        cache_size (int): The number of entries to keep.
+
+    Returns:
+        None: None.
+    """
+    entries = [
+        entry
+        for entry in os.scandir(cache_dir)
+        if entry.is_file() and entry.name.endswith(CACHE_ENTRY_EXTENSION)
+    ]
+
+    for entry in sorted(entries, key=lambda entry: entry.stat().st_mtime)[
+        : max(len(entries) - cache_size, 0)
+    ]:
+        try:
+            os.remove(entry.path)
+        except FileNotFoundError:
+            pass
+
+
+def store_cached_key(
+    cache_dir: str,
+    letters: np.ndarray,
+    key: List[int],
+    chi_squared: float,
+    engine_version: str,
+    cache_size: int = DEFAULT_CACHE_SIZE,
+) -> None:
+    """
+    Store the key cracked for some letters, evicting old entries past cache_size.
+
+    Args:
+        cache_dir (str): The directory holding the cache.
+        letters (np.ndarray): The letters as positions in alphabet.
+        key (List[int]): The key cracked for the letters.
+        chi_squared (float): The chi squared value of the solution for the key.
+        engine_version (str): The version of the engine the key came from.
+        cache_size (int): The most entries to keep in the cache.
+
+    Returns:
+        None: None.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    path = cache_entry_path(cache_dir=cache_dir, letters=letters)
+    temporary_path = f"{path}.{os.getpid()}.tmp"
+
+    file_handler(
+        path=temporary_path,
+        mode="w",
+        func=lambda f: json.dump(
+            {
+                "key": [int(letter) for letter in key],
+                "chi_squared": float(chi_squared),
+                "engine_version": engine_version,
+            },
+            f,
+        ),
+    )
+    os.replace(temporary_path, path)
+    evict_least_recently_used(cache_dir=cache_dir, cache_size=cache_size)
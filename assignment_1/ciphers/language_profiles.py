@@ -0,0 +1,256 @@
+import numpy as np
+
+"""
+Source:
+https://www.sttmedia.com/characterfrequency-english
+"""
+ENGLISH_LETTER_FREQUENCIES = np.array(
+    [
+        0.0834,
+        0.0154,
+        0.0273,
+        0.0414,
+        0.126,
+        0.0203,
+        0.0192,
+        0.0611,
+        0.0671,
+        0.0023,
+        0.0087,
+        0.0424,
+        0.0253,
+        0.068,
+        0.077,
+        0.0166,
+        0.0009,
+        0.0568,
+        0.0611,
+        0.0937,
+        0.0285,
+        0.0106,
+        0.0234,
+        0.002,
+        0.0204,
+        0.0006,
+    ]
+)
+
+"""
+Source:
+https://en.wikipedia.org/wiki/Letter_frequency
+Percentages from a to z, with accented letters added to the letter
+replace_non_ascii_with_alike_char turns them into.
+"""
+LANGUAGE_LETTER_PERCENTAGES = {
+    "french": np.array(
+        [
+            8.422,
+            0.901,
+            3.345,
+            3.669,
+            17.115,
+            1.066,
+            0.866,
+            0.737,
+            7.609,
+            0.613,
+            0.074,
+            5.456,
+            2.968,
+            7.095,
+            5.819,
+            2.521,
+            1.362,
+            6.693,
+            7.948,
+            7.244,
+            6.562,
+            1.838,
+            0.049,
+            0.427,
+            0.128,
+            0.326,
+        ]
+    ),
+    "german": np.array(
+        [
+            7.094,
+            1.886,
+            2.732,
+            5.076,
+            16.396,
+            1.656,
+            3.009,
+            4.577,
+            6.550,
+            0.268,
+            1.417,
+            3.437,
+            2.534,
+            9.776,
+            3.037,
+            0.670,
+            0.018,
+            7.003,
+            7.884,
+            6.154,
+            5.161,
+            0.846,
+            1.921,
+            0.034,
+            0.039,
+            1.134,
+        ]
+    ),
+    "spanish": np.array(
+        [
+            12.027,
+            2.215,
+            4.019,
+            5.010,
+            12.614,
+            0.692,
+            1.768,
+            0.703,
+            6.972,
+            0.493,
+            0.011,
+            4.967,
+            3.157,
+            7.023,
+            9.510,
+            2.510,
+            0.877,
+            6.871,
+            7.977,
+            4.632,
+            3.095,
+            1.138,
+            0.017,
+            0.215,
+            1.008,
+            0.467,
+        ]
+    ),
+    "italian": np.array(
+        [
+            12.380,
+            0.927,
+            4.501,
+            3.736,
+            12.055,
+            1.153,
+            1.644,
+            0.636,
+            10.173,
+            0.011,
+            0.009,
+            6.510,
+            2.512,
+            6.883,
+            9.834,
+            3.056,
+            0.505,
+            6.367,
+            4.981,
+            5.623,
+            3.177,
+            2.097,
+            0.033,
+            0.003,
+            0.020,
+            1.181,
+        ]
+    ),
+    "portuguese": np.array(
+        [
+            16.752,
+            1.043,
+            4.412,
+            4.992,
+            13.490,
+            1.023,
+            1.303,
+            0.781,
+            6.318,
+            0.397,
+            0.015,
+            2.779,
+            4.738,
+            4.446,
+            10.546,
+            2.523,
+            1.204,
+            6.530,
+            6.805,
+            4.336,
+            3.779,
+            1.575,
+            0.037,
+            0.253,
+            0.006,
+            0.470,
+        ]
+    ),
+}
+LANGUAGE_LETTER_FREQUENCIES = {
+    "english": ENGLISH_LETTER_FREQUENCIES,
+    **{
+        language: letter_percentages / letter_percentages.sum()
+        for language, letter_percentages in LANGUAGE_LETTER_PERCENTAGES.items()
+    },
+}
+LANGUAGES = list(LANGUAGE_LETTER_FREQUENCIES)
+AUTO_DETECT_LANGUAGE = "auto"
+
+
+def build_log_shift_profiles() -> np.ndarray:
+    """
+    Build the log frequency of every letter under every shift for every language.
+
+    Returns:
+        np.ndarray: A (language, letter, shift) tensor where [l, c, s] is the log
+        frequency in language l of the letter c decrypts to with shift s.
+    """
+    positions = np.arange(26)
+    return np.log(
+        np.stack([LANGUAGE_LETTER_FREQUENCIES[language] for language in LANGUAGES])[
+            :, (positions[:, np.newaxis] - positions[np.newaxis, :]) % 26
+        ]
+    )
+
+
+LOG_SHIFT_PROFILES = build_log_shift_profiles()
+
+
+def score_languages(letter_counts: np.ndarray) -> np.ndarray:
+    """
+    Score how likely the columns of a ciphertext are to be in every language,
+    taking the best shift of each column.
+
+    Args:
+        letter_counts (np.ndarray): A (key_length, 26) matrix of letter counts
+        of each column of the ciphertext.
+
+    Returns:
+        np.ndarray: The log likelihood of the columns for each language in LANGUAGES.
+    """
+    return (
+        np.einsum("nc,lcs->lns", letter_counts, LOG_SHIFT_PROFILES)
+        .max(axis=2)
+        .sum(axis=1)
+    )
+
+
+def detect_language(letter_counts: np.ndarray) -> str:
+    """
+    Detect the language of a ciphertext from the letter counts of its columns.
+
+    Args:
+        letter_counts (np.ndarray): A (key_length, 26) matrix of letter counts
+        of each column of the ciphertext.
+
+    Returns:
+        str: The most likely language in LANGUAGES.
+    """
+    return LANGUAGES[int(np.argmax(score_languages(letter_counts=letter_counts)))]
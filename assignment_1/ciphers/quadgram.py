@@ -0,0 +1,158 @@
+import os
+import string
+from functools import lru_cache
+from typing import List
+import numpy as np
+from .utils import file_handler
+
+ROOT_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+QUADGRAM_TABLE_PATH = os.path.join(
+    ROOT_DIRECTORY, "ciphers", "data", "english_quadgrams.npy"
+)
+"""
+Source:
+Opticks by Isaac Newton, the public domain Project Gutenberg edition, kept
+apart from the sample and test texts so the table is not fitted to the texts
+it is tested on.
+"""
+QUADGRAM_CORPUS_PATHS = [
+    os.path.join(ROOT_DIRECTORY, "ciphers", "data", "english_corpus.txt")
+]
+QUADGRAM_FLOOR_COUNT = 0.01
+REFINE_MAX_LETTERS = 4096
+
+
+def quadgram_indices(letters: np.ndarray) -> np.ndarray:
+    """
+    Find the index into the quadgram table of every quadgram along the last axis.
+
+    Args:
+        letters (np.ndarray): Letters as positions in alphabet.
+
+    Returns:
+        np.ndarray: The index of each run of four letters.
+    """
+    letters = letters.astype(np.int32)
+    return (
+        (letters[..., :-3] * 26 + letters[..., 1:-2]) * 26 + letters[..., 2:-1]
+    ) * 26 + letters[..., 3:]
+
+
+def build_quadgram_table(corpus: str) -> np.ndarray:
+    """
+    Build a table of quadgram log probabilities from a corpus, giving unseen
+    quadgrams a floor probability.
+
+    Args:
+        corpus (str): English text.
+
+    Returns:
+        np.ndarray: The log10 probability of every quadgram, indexed by quadgram_indices.
+    """
+    corpus_as_bytes = np.frombuffer(
+        corpus.lower().encode("ascii", errors="ignore"), dtype=np.uint8
+    )
+    letters = corpus_as_bytes[
+        np.isin(
+            corpus_as_bytes, np.frombuffer(string.ascii_lowercase.encode(), np.uint8)
+        )
+    ] - ord("a")
+    quadgram_counts = np.bincount(quadgram_indices(letters), minlength=26**4)
+    return np.log10(
+        np.where(quadgram_counts > 0, quadgram_counts, QUADGRAM_FLOOR_COUNT)
+        / quadgram_counts.sum()
+    ).astype(np.float32)
+
+
+@lru_cache(maxsize=None)
+def load_quadgram_table() -> np.ndarray:
+    """
+    Load the quadgram table the first time it is needed.
+
+    Returns:
+        np.ndarray: The log10 probability of every quadgram.
+    """
+    return np.load(QUADGRAM_TABLE_PATH).astype(np.float32)
+
+
+def quadgram_fitness(letters: np.ndarray) -> np.ndarray:
+    """
+    Score how English text looks by summing its quadgram log probabilities.
+
+    Args:
+        letters (np.ndarray): Letters as positions in alphabet, or a batch of
+        texts with the letters along the last axis.
+
+    Returns:
+        np.ndarray: The fitness of the text, higher being more English like.
+    """
+    return load_quadgram_table()[quadgram_indices(letters)].sum(axis=-1)
+
+
+def refine_key(
+    encrypted_text: np.ndarray,
+    key: List[int],
+    max_letters: int = REFINE_MAX_LETTERS,
+) -> List[int]:
+    """
+    Hill climb the key by quadgram fitness, trying all 26 letters at each
+    position of the key at once and keeping the best, until no change helps.
+
+    Args:
+        encrypted_text (np.ndarray): The text to decrypt.
+        key (List[int]): The key to refine, which is changed in place.
+        max_letters (int): The number of letters at the start of the text to score.
+
+    Returns:
+        List[int]: The refined key.
+    """
+    encrypted_text = encrypted_text[:max_letters].astype(np.int16)
+    key_positions = np.arange(encrypted_text.size) % len(key)
+    best_fitness = quadgram_fitness(
+        (encrypted_text - np.asarray(key, dtype=np.int16)[key_positions]) % 26
+    )
+    has_improved = True
+
+    while has_improved:
+        has_improved = False
+
+        for pos in range(len(key)):
+            candidate_keys = np.tile(np.asarray(key, dtype=np.int16), (26, 1))
+            candidate_keys[:, pos] = np.arange(26)
+            candidate_fitness = quadgram_fitness(
+                (encrypted_text - candidate_keys[:, key_positions]) % 26
+            )
+            best_letter = int(np.argmax(candidate_fitness))
+
+            if candidate_fitness[best_letter] > best_fitness:
+                best_fitness = candidate_fitness[best_letter]
+                key[pos] = best_letter
+                has_improved = True
+
+    return key
+
+
+def save_quadgram_table(
+    corpus_paths: List[str] = QUADGRAM_CORPUS_PATHS,
+    table_path: str = QUADGRAM_TABLE_PATH,
+) -> None:
+    """
+    Build the quadgram table from the corpus files and save it.
+
+    Args:
+        corpus_paths (List[str]): The English text files to build the table from.
+        table_path (str): The path to save the table to.
+
+    Returns:
+        None: None.
+    """
+    corpus = "\n".join(
+        file_handler(path=path, mode="r", func=lambda f: f.read())
+        for path in corpus_paths
+    )
+    os.makedirs(os.path.dirname(table_path), exist_ok=True)
+    np.save(table_path, build_quadgram_table(corpus).astype(np.float16))
+
+
+if __name__ == "__main__":
+    save_quadgram_table()
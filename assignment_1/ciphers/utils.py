@@ -1,4 +1,11 @@
-def file_handler(path, mode, func):
+import codecs
+from functools import lru_cache
+from unidecode import unidecode
+
+TRANSLITERATE_ERROR_HANDLER = "ciphers_transliterate"
+
+
+def file_handler(path, mode, func, newline=None):
     """
     This function is used to read the file and return the content of / write content to the file
 
@@ -6,12 +13,13 @@ def file_handler(path, mode, func):
         path: path to the file
         mode: mode to open the file in
         func: function to perform on the file
+        newline: newline translation of the file, "" to keep every "\r" and "\n" as is
 
     Returns:
         content of the file
     """
     try:
-        with open(path, mode) as f:
+        with open(path, mode, newline=newline) as f:
             return func(f)
     except FileNotFoundError:
         return 0
@@ -25,3 +33,73 @@ output_for_file = (
     "{text}\n"
     "-----END {mode} TEXT-----\n"
 )
+
+output_for_key_candidates = (
+    "\n-----BEGIN {cipher} KEY CANDIDATES-----\n"
+    "{candidates}\n"
+    "-----END {cipher} KEY CANDIDATES-----\n"
+)
+
+
+def read_in_chunks(file, chunk_size):
+    """
+    This function is used to lazily read an open file in fixed size chunks
+
+    Args:
+        file: open file to read from
+        chunk_size: number of characters (or bytes) to read at a time
+
+    Returns:
+        iterator over the chunks of the file
+    """
+    return iter(lambda: file.read(chunk_size), file.read(0))
+
+
+def output_for_file_around_text(**kwargs):
+    """
+    This function is used to split the output for file either side of the text,
+    so the text can be written in pieces
+
+    Args:
+        kwargs: values for the cipher, key and mode fields of the output
+
+    Returns:
+        the output before the text and the output after the text
+    """
+    before_text, after_text = output_for_file.split("{text}")
+    return before_text.format(**kwargs), after_text.format(**kwargs)
+
+
+@lru_cache(maxsize=None)
+def transliterate_character(character):
+    """
+    This function is used to find the ascii representation of a character,
+    remembering it for next time
+
+    Args:
+        character: the non-ascii character
+
+    Returns:
+        the ascii representation from unidecode
+    """
+    return unidecode(character)
+
+
+def transliterate_non_ascii_run(error):
+    """
+    This function is used to replace a run of characters a codec could not
+    encode, as the codecs error handler TRANSLITERATE_ERROR_HANDLER
+
+    Args:
+        error: UnicodeEncodeError covering the run of characters
+
+    Returns:
+        the ascii representation of the run and the position to carry on encoding from
+    """
+    return (
+        "".join(map(transliterate_character, error.object[error.start : error.end])),
+        error.end,
+    )
+
+
+codecs.register_error(TRANSLITERATE_ERROR_HANDLER, transliterate_non_ascii_run)
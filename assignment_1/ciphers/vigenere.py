@@ -1,74 +1,130 @@
-from typing import Dict, List
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import closing
+from multiprocessing.shared_memory import SharedMemory
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Tuple, Union
 import numpy as np
+import os
 import string
-import re
-from .utils import file_handler, output_for_file
-from unidecode import unidecode
+import sys
+from .key_cache import DEFAULT_CACHE_SIZE, load_cached_key, store_cached_key
+from .language_profiles import (
+    AUTO_DETECT_LANGUAGE,
+    ENGLISH_LETTER_FREQUENCIES,
+    LANGUAGE_LETTER_FREQUENCIES,
+    detect_language,
+)
+from .quadgram import refine_key
+from . import vigenere_kernels
+from .utils import (
+    TRANSLITERATE_ERROR_HANDLER,
+    file_handler,
+    output_for_file,
+    output_for_file_around_text,
+    output_for_key_candidates,
+    read_in_chunks,
+)
 from warnings import warn
 
 ASCII_OFFSET = ord("a")
-
-"""
-Source: 
-https://www.sttmedia.com/characterfrequency-english
-"""
-ENGLISH_LETTER_FREQUENCIES = np.array(
-    [
-        0.0834,
-        0.0154,
-        0.0273,
-        0.0414,
-        0.126,
-        0.0203,
-        0.0192,
-        0.0611,
-        0.0671,
-        0.0023,
-        0.0087,
-        0.0424,
-        0.0253,
-        0.068,
-        0.077,
-        0.0166,
-        0.0009,
-        0.0568,
-        0.0611,
-        0.0937,
-        0.0285,
-        0.0106,
-        0.0234,
-        0.002,
-        0.0204,
-        0.0006,
-    ]
+UPPERCASE_BIT = 0x20
+ALPHABET_LOOKUP = np.frombuffer(string.ascii_lowercase.encode("ascii"), dtype=np.uint8)
+LETTER_LOOKUP = np.array([chr(byte) in string.ascii_letters for byte in range(256)])
+LETTER_POSITION_LOOKUP = np.array(
+    [string.ascii_lowercase.find(chr(byte).lower()) % 26 for byte in range(256)],
+    dtype=np.uint8,
+)
+WHITESPACE_LOOKUP = np.array(
+    [chr(byte).isspace() and byte < 128 for byte in range(256)]
 )
 
 CHI_SQUARED_LIMIT = 1.00
+MAX_KEY_LENGTH = 64
+IOC_MIN_COLUMN_LENGTH = 20
+IOC_TOLERANCE = 0.9
+INITIAL_SAMPLE_SIZE = 1 << 14
+STABLE_SAMPLE_ROUNDS = 2
+DEFAULT_CHUNK_SIZE = 1 << 20
+ENGINE_VERSION = "1"
+KERNEL_BACKENDS = ("numpy", "numba")
+KERNEL_BACKEND = "numba" if vigenere_kernels.NUMBA_AVAILABLE else "numpy"
+DIRECT_COINCIDENCE_MAX_SIZE = 1 << 12
+
+
+class KeyCandidate(NamedTuple):
+    """
+    A possible key from return_top_key_candidates.
+    """
+
+    key: List[int]
+    key_length: int
+    chi_squared: float
+    confidence: List[float]
+
+
+def convert_text_to_bytes(text: Union[str, bytes, np.ndarray]) -> np.ndarray:
+    """
+    View ASCII text as an array of bytes.
+
+    Args:
+        text (Union[str, bytes, np.ndarray]): The ASCII text to view.
+
+    Returns:
+        np.ndarray: The text as an array of bytes.
+    """
+    if isinstance(text, np.ndarray):
+        return text.view(np.uint8).reshape(-1)
+
+    if isinstance(text, str):
+        text = text.encode("ascii")
+
+    return np.frombuffer(text, dtype=np.uint8)
+
+
+def normalize_text(
+    text: Union[str, bytes, np.ndarray],
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Drop every non-letter from ASCII text and fold the letters to their
+    position in alphabet with a single lookup table gather.
+
+    Args:
+        text (Union[str, bytes, np.ndarray]): The ASCII text to normalize.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: The letters as positions in alphabet and
+        the mask of the letter positions in the text, for restore_punctuation_to_string.
+    """
+    text_as_bytes = convert_text_to_bytes(text)
+    letter_mask = find_letter_mask(text_as_bytes)
+    return LETTER_POSITION_LOOKUP[text_as_bytes[letter_mask]], letter_mask
 
 
 def convert_text_to_position_in_alphabet(text: str) -> np.ndarray:
     """
-    Convert text to numbers.
+    Convert text to numbers. Non-ASCII characters are transliterated first, so
+    both ASCII and non-ASCII text give uint8 positions in alphabet.
 
     Args:
         text (str): The text to convert.
 
     Returns:
-        list: A list of numbers each representing a letter's position in alphabet.
+        np.ndarray: The position in alphabet of each letter as uint8.
     """
-    stripped_string = (
-        re.sub(r"\s+", "", text)
-        .lower()
-        .translate(str.maketrans("", "", string.punctuation))
-        .translate(str.maketrans("", "", string.digits))
-    )
-    return np.array([ord(c) - ASCII_OFFSET for c in stripped_string])
+    if not (text.isascii()):
+        text = text.encode("ascii", errors=TRANSLITERATE_ERROR_HANDLER)
+
+    return normalize_text(text)[0]
 
 
 def count_shifted_coincidences(encrypted_text: np.ndarray) -> np.ndarray:
     """
     Count the number of times coincidences occur in encrypted text.
 
+    The counts for every shift are found at once by summing the autocorrelation
+    of each letter's one-hot indicator, computed with an FFT in O(n log n).
+    With the numba kernel backend, texts of up to DIRECT_COINCIDENCE_MAX_SIZE
+    letters are counted directly instead, which is faster at that size.
+
     Args:
         encrypted_text (np.ndarray): The encrypted text to count coincidences in.
 
@@ -76,19 +132,24 @@ def count_shifted_coincidences(encrypted_text: np.ndarray) -> np.ndarray:
         np.ndarray: A list of numbers each representing the
         number of coincidences for each shifted row.
     """
-    coincidence_count = np.zeros(encrypted_text.size - 1)
-    shifted_row = encrypted_text[:-1]
+    if KERNEL_BACKEND == "numba" and encrypted_text.size <= DIRECT_COINCIDENCE_MAX_SIZE:
+        return vigenere_kernels.count_shifted_coincidences(
+            np.ascontiguousarray(encrypted_text, dtype=np.uint8)
+        )
+
+    if encrypted_text.size < 2:
+        return np.zeros(max(encrypted_text.size - 1, 0))
+
+    fft_size = 1 << int(2 * encrypted_text.size - 1).bit_length()
+    power_spectrum = np.zeros(fft_size // 2 + 1)
 
-    for n in range(1, len(encrypted_text)):
-        count = 0
+    for letter in np.unique(encrypted_text):
+        letter_spectrum = np.fft.rfft(encrypted_text == letter, n=fft_size)
+        power_spectrum += np.square(np.abs(letter_spectrum))
 
-        for pos, char in enumerate(shifted_row):
-            if char == encrypted_text[n + pos]:
-                count += 1
-        coincidence_count[n - 1] = count
-        shifted_row = shifted_row[:-1]
+    autocorrelation = np.fft.irfft(power_spectrum, n=fft_size)
 
-    return coincidence_count
+    return np.rint(autocorrelation[1 : encrypted_text.size])
 
 
 def key_length_counter(coincidence_count: np.ndarray) -> Dict[int, int]:
@@ -136,28 +197,41 @@ def sort_key_lengths(key_lengths: Dict[int, int]) -> List[int]:
     return [v[0] for v in sorted(key_lengths.items(), key=lambda kv: (-kv[1], kv[0]))]
 
 
-def prune_possible_keys(sorted_key_lengths: List[int]) -> List[int]:
+def prune_possible_keys(
+    sorted_key_lengths: List[int],
+    max_key_length: int = None,
+    max_candidates: int = None,
+) -> List[int]:
     """
-    Prune the possible key lengths.
+    Prune the possible key lengths, dropping every key length that is a multiple
+    of a key length ranked before it. The multiples of each kept key length are
+    struck out of a boolean array indexed by length, sieve style.
 
     Args:
-        sort_keys (List[int]): A list of key lengths sorted first by appearance frequency than length.
+        sorted_key_lengths (List[int]): A list of key lengths sorted first by appearance frequency than length.
+        max_key_length (int): Drop key lengths longer than this, or None for no limit.
+        max_candidates (int): Keep at most this many key lengths, or None for no limit.
 
     Returns:
-        List: A list of key lengths pruned.
+        List: A new list of key lengths pruned, in the order given.
     """
-    list_to_check = sorted_key_lengths[1:]
-    element_number = 0
+    if max_key_length is None:
+        max_key_length = max(sorted_key_lengths, default=0)
+
+    is_struck_out = np.zeros(max_key_length + 1, dtype=bool)
+    pruned_key_lengths = []
+
+    for key_length in sorted_key_lengths:
+        if max_candidates is not None and len(pruned_key_lengths) >= max_candidates:
+            break
 
-    while len(list_to_check):
-        key_length = sorted_key_lengths[element_number]
-        for other_key_length in list_to_check:
-            if other_key_length % key_length == 0:
-                sorted_key_lengths.remove(other_key_length)
-        element_number += 1
-        list_to_check = sorted_key_lengths[element_number + 1 :]
+        if key_length > max_key_length or is_struck_out[key_length]:
+            continue
 
-    return sorted_key_lengths
+        pruned_key_lengths.append(key_length)
+        is_struck_out[key_length::key_length] = True
+
+    return pruned_key_lengths
 
 
 def count_of_every_nth_letter(
@@ -229,9 +303,80 @@ def find_letter_in_key(
     return best_shift
 
 
+def build_shift_score_matrix(
+    expected_letter_frequency: np.ndarray = ENGLISH_LETTER_FREQUENCIES,
+) -> np.ndarray:
+    """
+    Build the circulant matrix used to score every shift of a letter frequency.
+
+    Args:
+        expected_letter_frequency (np.ndarray): The expected frequency of each letter.
+
+    Returns:
+        np.ndarray: A matrix where (frequencies @ matrix)[shift] is the score
+        find_letter_in_key gives to that shift.
+    """
+    alphabet_size = expected_letter_frequency.size
+    positions = np.arange(alphabet_size)
+    return expected_letter_frequency[
+        (positions[:, np.newaxis] - positions[np.newaxis, :]) % alphabet_size
+    ]
+
+
+SHIFT_SCORE_MATRICES = {
+    language: build_shift_score_matrix(letter_frequencies)
+    for language, letter_frequencies in LANGUAGE_LETTER_FREQUENCIES.items()
+}
+ENGLISH_SHIFT_SCORE_MATRIX = SHIFT_SCORE_MATRICES["english"]
+
+
+def count_of_every_nth_letter_for_all_positions(
+    encrypted_text: np.ndarray, n: int
+) -> np.ndarray:
+    """
+    Count the frequency of letters searching every nth letter for every start index.
+
+    Args:
+        encrypted_text (np.ndarray): The text to count letters in.
+        n (int): The nth letter to count.
+
+    Returns:
+        np.ndarray: A (n, 26) matrix where row i is count_of_every_nth_letter
+        with start_index=i.
+    """
+    if KERNEL_BACKEND == "numba":
+        return vigenere_kernels.count_of_every_nth_letter_for_all_positions(
+            np.ascontiguousarray(encrypted_text, dtype=np.uint8), n
+        )
+
+    positions = np.arange(encrypted_text.size) % n
+    return np.bincount(positions * 26 + encrypted_text, minlength=n * 26).reshape(n, 26)
+
+
+def score_every_shift_for_all_positions(
+    letter_counts: np.ndarray,
+    shift_score_matrix: np.ndarray = ENGLISH_SHIFT_SCORE_MATRIX,
+) -> np.ndarray:
+    """
+    Score every possible shift for every position in the key.
+
+    Args:
+        letter_counts (np.ndarray): A (key_length, 26) matrix of letter counts.
+        shift_score_matrix (np.ndarray): The matrix from build_shift_score_matrix.
+
+    Returns:
+        np.ndarray: A (key_length, 26) matrix of scores for each shift.
+    """
+    letter_frequencies = letter_counts / np.maximum(
+        letter_counts.sum(axis=1, keepdims=True), 1
+    )
+    return letter_frequencies @ shift_score_matrix
+
+
 def find_possible_key(
     encrypted_text: np.ndarray,
     key_length: int,
+    language: str = "english",
 ) -> List[int]:
     """
     Find the possible key.
@@ -239,20 +384,58 @@ def find_possible_key(
     Args:
         encrypted_text (np.ndarray): The text to decrypt.
         key_length (int): The length of the key.
+        language (str): The language in LANGUAGE_LETTER_FREQUENCIES of the text.
 
     Returns:
         np.ndarray: A possible key.
     """
-    return [
-        find_letter_in_key(
-            frequency_of_every_nth_letter(
-                count_of_every_nth_letter(
-                    encrypted_text=encrypted_text, n=key_length, start_index=pos
-                )
+    return np.argmax(
+        score_every_shift_for_all_positions(
+            letter_counts=count_of_every_nth_letter_for_all_positions(
+                encrypted_text=encrypted_text, n=key_length
             ),
+            shift_score_matrix=SHIFT_SCORE_MATRICES[language],
+        ),
+        axis=1,
+    ).tolist()
+
+
+def tile_key(key: List[int], length: int) -> np.ndarray:
+    """
+    Repeat the key until it covers the text.
+
+    Args:
+        key (List[int]): The key to repeat.
+        length (int): The length of the text the key is applied to.
+
+    Returns:
+        np.ndarray: The key repeated and truncated to length.
+    """
+    return np.resize(np.asarray(key, dtype=np.int16), length)
+
+
+def apply_key(text: np.ndarray, key: List[int], mode: int = -1) -> np.ndarray:
+    """
+    Apply the key to the whole text in one array operation.
+
+    Args:
+        text (np.ndarray): The text as letter positions in alphabet.
+        key (List[int]): The key to apply.
+        mode (int): The mode -1 being decrypt, 1 being encrypt.
+
+    Returns:
+        np.ndarray: The text with the key applied as letter positions in alphabet.
+    """
+    if KERNEL_BACKEND == "numba" and len(key):
+        return vigenere_kernels.apply_key(
+            np.ascontiguousarray(text, dtype=np.uint8),
+            np.asarray(key, dtype=np.int64),
+            mode,
         )
-        for pos in range(key_length)
-    ]
+
+    return (
+        (text.astype(np.int16) + mode * tile_key(key=key, length=text.size)) % 26
+    ).astype(np.uint8)
 
 
 def return_solution_for_key(key: List[int], encrypted_text: np.ndarray) -> np.ndarray:
@@ -267,26 +450,25 @@ def return_solution_for_key(key: List[int], encrypted_text: np.ndarray) -> np.nd
         np.ndarray: The decrypted text as array of numbers representing letter
         position in alphabet.
     """
-    potential_solution = np.empty((encrypted_text.size,), dtype=np.uint8)
+    return apply_key(text=encrypted_text, key=key, mode=-1)
 
-    for pos, char in enumerate(encrypted_text):
-        potential_solution[pos] = (char - key[pos % len(key)]) % 26
 
-    return potential_solution
-
-
-def calculate_chi_squared(sentence: np.ndarray) -> float:
+def calculate_chi_squared(
+    sentence: np.ndarray,
+    expected_letter_frequency: np.ndarray = ENGLISH_LETTER_FREQUENCIES,
+) -> float:
     """
     Calculate the chi squared value.
 
     Args:
         sentence (np.ndarray): The sentence to calculate the chi squared value for.
+        expected_letter_frequency (np.ndarray): The expected frequency of each letter.
 
     Returns:
         float: The chi squared value.
     """
     observed_frequency = np.bincount(sentence, minlength=26)
-    expected_frequency = ENGLISH_LETTER_FREQUENCIES * sentence.size
+    expected_frequency = expected_letter_frequency * sentence.size
     return np.sum(
         np.square(observed_frequency - expected_frequency) / expected_frequency
     )
@@ -311,44 +493,587 @@ def return_sorted_possible_key_lengths(
     )
 
 
-def return_best_key(encrypted_text: np.ndarray):
+def index_of_coincidence_from_letter_counts(letter_counts: np.ndarray) -> float:
     """
-    Return the most likely key.
+    Calculate the average index of coincidence of the columns of a key length.
+
+    Args:
+        letter_counts (np.ndarray): A (key_length, 26) matrix of letter counts.
+
+    Returns:
+        float: The index of coincidence averaged over every position in the key.
+    """
+    column_lengths = letter_counts.sum(axis=1)
+    return np.mean(
+        np.sum(letter_counts * (letter_counts - 1), axis=1)
+        / np.maximum(column_lengths * (column_lengths - 1), 1)
+    )
+
+
+def average_index_of_coincidence(
+    encrypted_text: np.ndarray, max_key_length: int = MAX_KEY_LENGTH
+) -> np.ndarray:
+    """
+    Calculate the average index of coincidence for every key length up to
+    max_key_length, leaving out key lengths with columns too short to trust.
 
     Args:
         encrypted_text (np.ndarray): The text to decrypt.
+        max_key_length (int): The longest key length to consider.
 
     Returns:
-        List[int]: The best key.
+        np.ndarray: The average index of coincidence where index i is key length i + 1.
+    """
+    max_key_length = max(
+        min(max_key_length, encrypted_text.size // IOC_MIN_COLUMN_LENGTH), 1
+    )
+    return np.array(
+        [
+            index_of_coincidence_from_letter_counts(
+                count_of_every_nth_letter_for_all_positions(
+                    encrypted_text=encrypted_text, n=key_length
+                )
+            )
+            for key_length in range(1, max_key_length + 1)
+        ]
+    )
+
+
+def sort_key_lengths_by_index_of_coincidence(
+    index_of_coincidence: np.ndarray,
+) -> List[int]:
     """
+    Sort the key lengths, putting those close to the best index of coincidence
+    first from shortest to longest, then the rest from highest index to lowest.
+
+    Args:
+        index_of_coincidence (np.ndarray): The average index of coincidence where
+        index i is key length i + 1.
+
+    Returns:
+        List[int]: The key lengths sorted.
+    """
+    is_close_to_best = index_of_coincidence >= IOC_TOLERANCE * np.max(
+        index_of_coincidence
+    )
+    other_key_lengths = np.flatnonzero(~is_close_to_best)
+    other_key_lengths = other_key_lengths[
+        np.argsort(-index_of_coincidence[other_key_lengths], kind="stable")
+    ]
+    return (
+        np.concatenate((np.flatnonzero(is_close_to_best), other_key_lengths)) + 1
+    ).tolist()
+
+
+def return_ioc_sorted_possible_key_lengths(
+    encrypted_text: np.ndarray,
+) -> List[int]:
+    """
+    Return the possible key lengths ranked by index of coincidence.
+
+    Args:
+        encrypted_text (np.ndarray): The text to decrypt.
+
+    Returns:
+        List[int]: The possible key lengths.
+    """
+    return sort_key_lengths_by_index_of_coincidence(
+        average_index_of_coincidence(encrypted_text=encrypted_text)
+    )
+
+
+KEY_LENGTH_ENGINES = {
+    "coincidence": return_sorted_possible_key_lengths,
+    "ioc": return_ioc_sorted_possible_key_lengths,
+}
+
+
+def find_converged_sample_size(
+    encrypted_text: np.ndarray,
+    key_length_engine: str = "coincidence",
+    initial_sample_size: int = INITIAL_SAMPLE_SIZE,
+    stable_rounds: int = STABLE_SAMPLE_ROUNDS,
+) -> int:
+    """
+    Find how much of the text is needed for the key length statistics to settle,
+    by ranking key lengths on doubling prefixes until the top ranked key length
+    is the same for stable_rounds rounds in a row.
+
+    Args:
+        encrypted_text (np.ndarray): The text to decrypt.
+        key_length_engine (str): The name of the engine in KEY_LENGTH_ENGINES.
+        initial_sample_size (int): The number of letters in the first prefix.
+        stable_rounds (int): The number of rounds the top key length must agree for.
+
+    Returns:
+        int: The number of letters at the start of the text to crack the key from.
+    """
+    sample_size = min(initial_sample_size, encrypted_text.size)
+    previous_best_key_length = None
+    agreeing_rounds = 0
+
+    while True:
+        possible_key_lengths = prune_possible_keys(
+            KEY_LENGTH_ENGINES[key_length_engine](encrypted_text[:sample_size])
+        )
+        best_key_length = possible_key_lengths[0] if possible_key_lengths else None
+
+        if best_key_length is not None and best_key_length == previous_best_key_length:
+            agreeing_rounds += 1
+        else:
+            agreeing_rounds = 1
+
+        if agreeing_rounds >= stable_rounds or sample_size == encrypted_text.size:
+            return sample_size
+
+        previous_best_key_length = best_key_length
+        sample_size = min(2 * sample_size, encrypted_text.size)
+
+
+def score_key_length(
+    encrypted_text: np.ndarray, key_length: int, language: str = "english"
+) -> Tuple[List[int], float]:
+    """
+    Find the possible key for a key length and score the solution it gives.
+
+    Args:
+        encrypted_text (np.ndarray): The text to decrypt.
+        key_length (int): The length of the key.
+        language (str): The language in LANGUAGE_LETTER_FREQUENCIES of the text.
+
+    Returns:
+        Tuple[List[int], float]: The possible key and the chi squared value of
+        the solution for it.
+    """
+    possible_key = find_possible_key(
+        encrypted_text=encrypted_text, key_length=key_length, language=language
+    )
+    possible_solution = return_solution_for_key(
+        key=possible_key, encrypted_text=encrypted_text
+    )
+    return possible_key, calculate_chi_squared(
+        sentence=possible_solution,
+        expected_letter_frequency=LANGUAGE_LETTER_FREQUENCIES[language],
+    )
+
+
+def score_key_length_in_shared_memory(
+    shared_memory_name: str, text_size: int, key_length: int, language: str
+) -> Tuple[List[int], float]:
+    """
+    Score a key length for text held in shared memory, for use in a worker process.
+
+    Args:
+        shared_memory_name (str): The name of the shared memory holding the text.
+        text_size (int): The number of letters in the text.
+        key_length (int): The length of the key.
+        language (str): The language in LANGUAGE_LETTER_FREQUENCIES of the text.
+
+    Returns:
+        Tuple[List[int], float]: The possible key and the chi squared value of
+        the solution for it.
+    """
+    shared_memory = SharedMemory(name=shared_memory_name)
+
+    try:
+        return score_key_length(
+            encrypted_text=np.ndarray(
+                (text_size,), dtype=np.uint8, buffer=shared_memory.buf
+            ),
+            key_length=key_length,
+            language=language,
+        )
+    finally:
+        shared_memory.close()
+
+
+def score_key_lengths_in_parallel(
+    encrypted_text: np.ndarray,
+    key_lengths: List[int],
+    workers: int,
+    language: str = "english",
+) -> Iterator[Tuple[List[int], float]]:
+    """
+    Score every key length across a pool of worker processes that share the
+    text through shared memory. Scores are given in the order of key_lengths and
+    any work not yet started is cancelled when the iterator is closed.
+
+    Args:
+        encrypted_text (np.ndarray): The text to decrypt.
+        key_lengths (List[int]): The key lengths to score.
+        workers (int): The number of worker processes.
+        language (str): The language in LANGUAGE_LETTER_FREQUENCIES of the text.
+
+    Returns:
+        Iterator[Tuple[List[int], float]]: The possible key and chi squared value
+        for each key length.
+    """
+    shared_memory = SharedMemory(create=True, size=max(encrypted_text.size, 1))
+    executor = ProcessPoolExecutor(max_workers=workers)
+
+    try:
+        np.copyto(
+            np.ndarray(
+                (encrypted_text.size,), dtype=np.uint8, buffer=shared_memory.buf
+            ),
+            encrypted_text,
+            casting="unsafe",
+        )
+        futures = [
+            executor.submit(
+                score_key_length_in_shared_memory,
+                shared_memory.name,
+                encrypted_text.size,
+                key_length,
+                language,
+            )
+            for key_length in key_lengths
+        ]
+
+        for future in futures:
+            yield future.result()
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+        shared_memory.close()
+        shared_memory.unlink()
+
+
+def return_possible_key_lengths_and_language(
+    encrypted_text: np.ndarray,
+    key_length_engine: str = "coincidence",
+    progressive: bool = False,
+    language: str = "english",
+) -> Tuple[np.ndarray, List[int], str]:
+    """
+    Return the text to crack the key from, the possible key lengths ranked and
+    pruned, and the language of the text.
+
+    Args:
+        encrypted_text (np.ndarray): The text to decrypt.
+        key_length_engine (str): The name of the engine in KEY_LENGTH_ENGINES used
+        to rank the possible key lengths.
+        progressive (bool): Crack the key from the shortest prefix of the text the
+        key length statistics have settled on, see find_converged_sample_size.
+        language (str): The language in LANGUAGE_LETTER_FREQUENCIES of the text, or
+        AUTO_DETECT_LANGUAGE to detect it from the columns of the best key length.
+
+    Returns:
+        Tuple[np.ndarray, List[int], str]: The text or the prefix of it to crack
+        the key from, the possible key lengths and the language.
+    """
+    if progressive:
+        encrypted_text = encrypted_text[
+            : find_converged_sample_size(
+                encrypted_text=encrypted_text, key_length_engine=key_length_engine
+            )
+        ]
+
+    possible_key_lengths = prune_possible_keys(
+        KEY_LENGTH_ENGINES[key_length_engine](encrypted_text)
+    ) or [1]
+
+    if language == AUTO_DETECT_LANGUAGE:
+        language = detect_language(
+            letter_counts=count_of_every_nth_letter_for_all_positions(
+                encrypted_text=encrypted_text, n=possible_key_lengths[0]
+            )
+        )
+
+    return encrypted_text, possible_key_lengths, language
+
+
+def score_key_lengths(
+    encrypted_text: np.ndarray,
+    key_lengths: List[int],
+    workers: int = 1,
+    language: str = "english",
+) -> Iterator[Tuple[List[int], float]]:
+    """
+    Score every key length in order, across a pool of worker processes when
+    workers is more than one.
+
+    Args:
+        encrypted_text (np.ndarray): The text to decrypt.
+        key_lengths (List[int]): The key lengths to score.
+        workers (int): The number of processes to score key lengths with.
+        language (str): The language in LANGUAGE_LETTER_FREQUENCIES of the text.
+
+    Returns:
+        Iterator[Tuple[List[int], float]]: The possible key and chi squared value
+        for each key length.
+    """
+    if workers > 1:
+        return score_key_lengths_in_parallel(
+            encrypted_text=encrypted_text,
+            key_lengths=key_lengths,
+            workers=workers,
+            language=language,
+        )
+
+    return (
+        score_key_length(
+            encrypted_text=encrypted_text,
+            key_length=key_length,
+            language=language,
+        )
+        for key_length in key_lengths
+    )
+
+
+def return_best_key_and_score(
+    encrypted_text: np.ndarray,
+    key_length_engine: str = "coincidence",
+    progressive: bool = False,
+    workers: int = 1,
+    refine: bool = False,
+    language: str = "english",
+) -> Tuple[List[int], float]:
+    """
+    Return the most likely key and the chi squared value of its solution.
+
+    Args:
+        encrypted_text (np.ndarray): The text to decrypt.
+        key_length_engine (str): The name of the engine in KEY_LENGTH_ENGINES used
+        to rank the possible key lengths.
+        progressive (bool): Crack the key from the shortest prefix of the text the
+        key length statistics have settled on, see find_converged_sample_size.
+        workers (int): The number of processes to score key lengths with.
+        refine (bool): Hill climb the best key by quadgram fitness, see refine_key.
+        language (str): The language in LANGUAGE_LETTER_FREQUENCIES of the text, or
+        AUTO_DETECT_LANGUAGE to detect it from the columns of the best key length.
+
+    Returns:
+        Tuple[List[int], float]: The best key and its chi squared value, or an
+        empty key if there are no letters.
+    """
+    if not (encrypted_text.size):
+        return [], float("inf")
+
+    encrypted_text, possible_key_lengths, language = (
+        return_possible_key_lengths_and_language(
+            encrypted_text=encrypted_text,
+            key_length_engine=key_length_engine,
+            progressive=progressive,
+            language=language,
+        )
+    )
     best_chi_squared = float("inf")
+    scored_key_lengths = score_key_lengths(
+        encrypted_text=encrypted_text,
+        key_lengths=possible_key_lengths,
+        workers=workers,
+        language=language,
+    )
+
+    with closing(scored_key_lengths):
+        for possible_key, chi_squared_score in scored_key_lengths:
+            if chi_squared_score < best_chi_squared:
+                best_chi_squared = chi_squared_score
+                best_key = possible_key
+
+            if (chi_squared_score / len(encrypted_text)) < CHI_SQUARED_LIMIT:
+                break
 
-    for possible_key_length in prune_possible_keys(
-        return_sorted_possible_key_lengths(encrypted_text)
-    ):
-        possible_key = find_possible_key(
-            encrypted_text=encrypted_text, key_length=possible_key_length
+    if refine:
+        best_key = refine_key(encrypted_text=encrypted_text, key=best_key)
+        best_chi_squared = calculate_chi_squared(
+            sentence=return_solution_for_key(
+                key=best_key, encrypted_text=encrypted_text
+            ),
+            expected_letter_frequency=LANGUAGE_LETTER_FREQUENCIES[language],
         )
 
-        possible_solution = return_solution_for_key(
-            key=possible_key, encrypted_text=encrypted_text
+    return best_key, best_chi_squared
+
+
+def key_confidence(shift_scores: np.ndarray) -> List[float]:
+    """
+    Find how clearly the best shift wins at every position in the key, as the
+    margin between the best and second best shift score relative to the best.
+
+    Args:
+        shift_scores (np.ndarray): A (key_length, 26) matrix of scores for each
+        shift from score_every_shift_for_all_positions.
+
+    Returns:
+        List[float]: The confidence from 0 to 1 of each letter in the key.
+    """
+    second_best, best = np.sort(shift_scores, axis=1)[:, -2:].T
+    return ((best - second_best) / np.where(best > 0, best, 1)).tolist()
+
+
+def return_top_key_candidates(
+    encrypted_text: np.ndarray,
+    top_k: int,
+    key_length_engine: str = "coincidence",
+    progressive: bool = False,
+    workers: int = 1,
+    language: str = "english",
+) -> List[KeyCandidate]:
+    """
+    Return the top_k most likely keys, scoring every possible key length once.
+    Keys whose solution passes CHI_SQUARED_LIMIT come first in the order their
+    key lengths are ranked, so the first is the key return_best_key_and_score
+    gives, then the rest from lowest chi squared value to highest.
+
+    Args:
+        encrypted_text (np.ndarray): The text to decrypt.
+        top_k (int): The number of keys to return.
+        key_length_engine (str): The name of the engine in KEY_LENGTH_ENGINES used
+        to rank the possible key lengths.
+        progressive (bool): Crack the keys from a prefix of the text.
+        workers (int): The number of processes to score key lengths with.
+        language (str): The language of the text, or AUTO_DETECT_LANGUAGE.
+
+    Returns:
+        List[KeyCandidate]: The most likely keys with their length, chi squared
+        value and the confidence of each letter.
+    """
+    encrypted_text, possible_key_lengths, language = (
+        return_possible_key_lengths_and_language(
+            encrypted_text=encrypted_text,
+            key_length_engine=key_length_engine,
+            progressive=progressive,
+            language=language,
+        )
+    )
+    scored_key_lengths = list(
+        score_key_lengths(
+            encrypted_text=encrypted_text,
+            key_lengths=possible_key_lengths,
+            workers=workers,
+            language=language,
         )
+    )
+    passes_limit = [
+        (chi_squared_score / len(encrypted_text)) < CHI_SQUARED_LIMIT
+        for _, chi_squared_score in scored_key_lengths
+    ]
+    ranked_key_lengths = sorted(
+        range(len(scored_key_lengths)),
+        key=lambda rank: (
+            not passes_limit[rank],
+            rank if passes_limit[rank] else scored_key_lengths[rank][1],
+        ),
+    )
+
+    return [
+        KeyCandidate(
+            key=possible_key,
+            key_length=len(possible_key),
+            chi_squared=float(chi_squared_score),
+            confidence=key_confidence(
+                score_every_shift_for_all_positions(
+                    letter_counts=count_of_every_nth_letter_for_all_positions(
+                        encrypted_text=encrypted_text, n=len(possible_key)
+                    ),
+                    shift_score_matrix=SHIFT_SCORE_MATRICES[language],
+                )
+            ),
+        )
+        for possible_key, chi_squared_score in (
+            scored_key_lengths[rank] for rank in ranked_key_lengths[:top_k]
+        )
+    ]
+
+
+def return_best_key(
+    encrypted_text: np.ndarray,
+    key_length_engine: str = "coincidence",
+    progressive: bool = False,
+    workers: int = 1,
+    refine: bool = False,
+    language: str = "english",
+) -> List[int]:
+    """
+    Return the most likely key.
+
+    Args:
+        encrypted_text (np.ndarray): The text to decrypt.
+        key_length_engine (str): The name of the engine in KEY_LENGTH_ENGINES used
+        to rank the possible key lengths.
+        progressive (bool): Crack the key from the shortest prefix of the text the
+        key length statistics have settled on, see find_converged_sample_size.
+        workers (int): The number of processes to score key lengths with.
+        refine (bool): Hill climb the best key by quadgram fitness, see refine_key.
+        language (str): The language of the text, or AUTO_DETECT_LANGUAGE.
+
+    Returns:
+        List[int]: The best key.
+    """
+    return return_best_key_and_score(
+        encrypted_text=encrypted_text,
+        key_length_engine=key_length_engine,
+        progressive=progressive,
+        workers=workers,
+        refine=refine,
+        language=language,
+    )[0]
+
 
-        chi_squared_score = calculate_chi_squared(sentence=possible_solution)
+def crack_key(
+    encrypted_text: np.ndarray,
+    key_length_engine: str = "coincidence",
+    progressive: bool = False,
+    workers: int = 1,
+    refine: bool = False,
+    language: str = "english",
+    cache_dir: str = None,
+    cache_size: int = DEFAULT_CACHE_SIZE,
+) -> List[int]:
+    """
+    Return the most likely key, looking it up in the key cache first when a
+    cache directory is given and storing it there after cracking.
 
-        if (chi_squared_score / len(encrypted_text)) < CHI_SQUARED_LIMIT:
-            return possible_key
+    Args:
+        encrypted_text (np.ndarray): The text to decrypt.
+        key_length_engine (str): The name of the engine in KEY_LENGTH_ENGINES.
+        progressive (bool): Crack the key from a prefix of the text.
+        workers (int): The number of processes to score key lengths with.
+        refine (bool): Hill climb the key by quadgram fitness.
+        language (str): The language of the text, or AUTO_DETECT_LANGUAGE.
+        cache_dir (str): The directory of the key cache, or None for no cache.
+        cache_size (int): The most entries to keep in the key cache.
 
-        if chi_squared_score < best_chi_squared:
-            best_chi_squared = chi_squared_score
-            best_key = possible_key
+    Returns:
+        List[int]: The best key.
+    """
+    engine_version = (
+        f"{ENGINE_VERSION}-{key_length_engine}-{progressive}-{refine}-{language}"
+    )
 
-    return best_key
+    if cache_dir:
+        cached_key = load_cached_key(
+            cache_dir=cache_dir, letters=encrypted_text, engine_version=engine_version
+        )
+        if cached_key is not None:
+            return cached_key[0]
+
+    key, chi_squared_score = return_best_key_and_score(
+        encrypted_text=encrypted_text,
+        key_length_engine=key_length_engine,
+        progressive=progressive,
+        workers=workers,
+        refine=refine,
+        language=language,
+    )
+
+    if cache_dir:
+        store_cached_key(
+            cache_dir=cache_dir,
+            letters=encrypted_text,
+            key=key,
+            chi_squared=chi_squared_score,
+            engine_version=engine_version,
+            cache_size=cache_size,
+        )
+
+    return key
 
 
 def apply_key_while_restoring_to_letters(
     text: np.ndarray, key: List[int], mode: int = -1
-):
+) -> str:
     """
     Apply the key to the text.
 
@@ -358,42 +1083,119 @@ def apply_key_while_restoring_to_letters(
         mode (int): The mode -1 being decrypt, 1 being encrypt.
 
     Returns:
-        np.ndarray: The text with the key applied."""
-    len_key = len(key)
-    return [
-        chr(((char + mode * key[pos % len_key]) % 26) + ASCII_OFFSET)
-        for pos, char in enumerate(text)
+        str: The text with the key applied as lowercase letters."""
+    return (
+        ALPHABET_LOOKUP[apply_key(text=text, key=key, mode=mode)]
+        .tobytes()
+        .decode("ascii")
+    )
+
+
+def find_letter_mask(text_as_bytes: np.ndarray) -> np.ndarray:
+    """
+    Find the positions of the letters in the text.
+
+    Args:
+        text_as_bytes (np.ndarray): The ASCII text as an array of bytes.
+
+    Returns:
+        np.ndarray: A boolean mask that is True where the text has a letter.
+    """
+    return LETTER_LOOKUP[text_as_bytes]
+
+
+def splice_letters_into_text(
+    text_as_bytes: np.ndarray, letters: np.ndarray, letter_mask: np.ndarray
+) -> np.ndarray:
+    """
+    Replace the letters of the text while keeping their original case.
+
+    Args:
+        text_as_bytes (np.ndarray): The ASCII text as an array of bytes.
+        letters (np.ndarray): The lowercase ASCII letters to put in the text.
+        letter_mask (np.ndarray): The positions of the letters in the text.
+
+    Returns:
+        np.ndarray: The text with its letters replaced as an array of bytes.
+    """
+    spliced_text = text_as_bytes.copy()
+    uppercase_mask = text_as_bytes[letter_mask] < ASCII_OFFSET
+    spliced_text[letter_mask] = np.where(
+        uppercase_mask, letters & ~np.uint8(UPPERCASE_BIT), letters
+    )
+    return spliced_text
+
+
+def collapse_whitespace(text_as_bytes: np.ndarray) -> np.ndarray:
+    """
+    Join the words of the text by single spaces, keeping every newline as its
+    own word and dropping trailing whitespace.
+
+    Args:
+        text_as_bytes (np.ndarray): The ASCII text as an array of bytes.
+
+    Returns:
+        np.ndarray: The text with its whitespace collapsed as an array of bytes.
+    """
+    non_space_positions = np.flatnonzero(~WHITESPACE_LOOKUP[text_as_bytes])
+
+    if non_space_positions.size == 0:
+        return np.empty((0,), dtype=np.uint8)
+
+    text_as_bytes = text_as_bytes[: non_space_positions[-1] + 1]
+    is_space = WHITESPACE_LOOKUP[text_as_bytes]
+    is_newline = text_as_bytes == ord("\n")
+    starts_space_run = is_space & ~np.concatenate(([True], is_space[:-1]))
+    starts_space_run[: non_space_positions[0]] = False
+
+    output_slots = np.empty((text_as_bytes.size, 3), dtype=np.uint8)
+    output_slots[:, 0] = ord(" ")
+    output_slots[:, 1] = text_as_bytes
+    output_slots[:, 2] = ord(" ")
+
+    return output_slots[
+        np.stack((starts_space_run, ~is_space | is_newline, is_newline), axis=1)
     ]
 
 
 def restore_punctuation_to_string(
-    original_string: str, modified_string: List[str]
+    original_string: str,
+    modified_string: Union[str, List[str]],
+    letter_mask: np.ndarray = None,
 ) -> str:
     """
     Restore the punctuation to the original string.
 
     Args:
         original_encrypted_string (str): The original encrypted string.
-        decrypted_string (List[str]): The decrypted string.
+        decrypted_string (Union[str, List[str]]): The decrypted letters.
+        letter_mask (np.ndarray): The letter mask from normalize_text, found
+        again from the original string if not given.
 
     Returns:
         str: The decrypted string with punctuation restored.
     """
-    original_string = re.findall(r"\S+|\n", original_string)
-    restored_string = ""
-
-    for word in original_string:
-        for char in word:
-            if char.isalpha():
-                if char.isupper():
-                    restored_string += modified_string.pop(0).upper()
-                else:
-                    restored_string += modified_string.pop(0)
-            else:
-                restored_string += char
-        restored_string += " "
-
-    return restored_string.rstrip()
+    original_as_bytes = np.frombuffer(original_string.encode("ascii"), dtype=np.uint8)
+    if not isinstance(modified_string, str):
+        modified_string = "".join(modified_string)
+
+    modified_as_bytes = np.frombuffer(modified_string.encode("ascii"), dtype=np.uint8)
+
+    return (
+        collapse_whitespace(
+            splice_letters_into_text(
+                text_as_bytes=original_as_bytes,
+                letters=modified_as_bytes,
+                letter_mask=(
+                    find_letter_mask(original_as_bytes)
+                    if letter_mask is None
+                    else letter_mask
+                ),
+            )
+        )
+        .tobytes()
+        .decode("ascii")
+    )
 
 
 def key_to_string(key_as_alpha_pos: List[int]):
@@ -413,12 +1215,32 @@ def key_to_string(key_as_alpha_pos: List[int]):
     return key.upper()
 
 
+def key_candidates_to_string(key_candidates: List[KeyCandidate]) -> str:
+    """
+    Convert the key candidates to a string with one candidate per line.
+
+    Args:
+        key_candidates (List[KeyCandidate]): The key candidates to convert.
+
+    Returns:
+        str: The key candidates as a string.
+    """
+    return "\n".join(
+        f"{rank}. {key_to_string(candidate.key)} "
+        f"length={candidate.key_length} "
+        f"chi_squared={candidate.chi_squared:.2f} "
+        f"confidence={' '.join(f'{value:.2f}' for value in candidate.confidence)}"
+        for rank, candidate in enumerate(key_candidates, start=1)
+    )
+
+
 def return_output_for_file(
     og_text: str,
     converted_text: np.ndarray,
     key: List[int],
     mode_as_word: str,
     mode_as_int: int,
+    letter_mask: np.ndarray = None,
 ):
     """
     Return the output for the file.
@@ -429,6 +1251,7 @@ def return_output_for_file(
         key (List[int]): The key.
         mode_as_word (str): The mode as a word.
         mode_as_int (int): The mode as an int.
+        letter_mask (np.ndarray): The letter mask of the original text.
 
     Returns:
         str: The output for the file.
@@ -442,13 +1265,16 @@ def return_output_for_file(
             modified_string=apply_key_while_restoring_to_letters(
                 text=converted_text, key=key, mode=mode_as_int
             ),
+            letter_mask=letter_mask,
         ),
     )
 
 
 def replace_non_ascii_with_alike_char(text: str) -> str:
     """
-    Replace non-ascii characters with a similar character.
+    Replace non-ascii characters with a similar character. The ascii codec skips
+    over the ascii text and only the runs of non-ascii characters it stops at are
+    transliterated, so mostly ascii text costs little more than ascii text.
 
     Args:
         text (str): The text to replace non-ascii characters in.
@@ -461,11 +1287,171 @@ def replace_non_ascii_with_alike_char(text: str) -> str:
         "with ASCII/English text. All non-English characters will be replaced "
         "with an alike representation.",
     )
-    return unidecode(text)
+    return text.encode("ascii", errors=TRANSLITERATE_ERROR_HANDLER).decode("ascii")
+
+
+def stream_vigenere_coding(
+    text_chunks: Iterable[str], key: List[int], mode: int = -1
+) -> Iterator[str]:
+    """
+    Apply the key to text arriving in chunks, giving the same text as
+    restore_punctuation_to_string would for the whole text at once.
+
+    Args:
+        text_chunks (Iterable[str]): The text to apply the key to in chunks.
+        key (List[int]): The key to apply.
+        mode (int): The mode -1 being decrypt, 1 being encrypt.
+
+    Returns:
+        Iterator[str]: The text with the key applied and punctuation restored in chunks.
+    """
+    letters_seen = 0
+    trailing_space = np.empty((0,), dtype=np.uint8)
+    has_written_word = False
+    word_sentinel = np.frombuffer(b"x", dtype=np.uint8)
+    space_sentinel = np.frombuffer(b" ", dtype=np.uint8)
+
+    for text_chunk in text_chunks:
+        if not (text_chunk.isascii()):
+            text_chunk = replace_non_ascii_with_alike_char(text_chunk)
+
+        chunk_as_bytes = convert_text_to_bytes(text_chunk)
+        letters, letter_mask = normalize_text(chunk_as_bytes)
+        key_for_chunk = np.roll(key, -letters_seen)
+        letters_seen += letters.size
+
+        spliced_chunk = splice_letters_into_text(
+            text_as_bytes=chunk_as_bytes,
+            letters=ALPHABET_LOOKUP[
+                apply_key(text=letters, key=key_for_chunk, mode=mode)
+            ],
+            letter_mask=letter_mask,
+        )
+        # a stand-in word stops the carried whitespace being treated as
+        # leading whitespace once a word has already been written
+        pending_text = np.concatenate(
+            (word_sentinel[: int(has_written_word)], trailing_space, spliced_chunk)
+        )
+        collapsed_text = collapse_whitespace(pending_text)[int(has_written_word) :]
+
+        # trailing whitespace is held back until the next word, only its
+        # newlines change the output
+        non_space_positions = np.flatnonzero(~WHITESPACE_LOOKUP[pending_text])
+        trailing_run = pending_text[
+            (non_space_positions[-1] + 1 if non_space_positions.size else 0) :
+        ]
+        trailing_space = np.concatenate(
+            (
+                space_sentinel[: int(trailing_run.size > 0)],
+                trailing_run[trailing_run == ord("\n")],
+            )
+        )
+        has_written_word |= collapsed_text.size > 0
+
+        yield collapsed_text.tobytes().decode("ascii")
+
+
+def read_letters_from_file(
+    ifile: str, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> np.ndarray:
+    """
+    Read only the letters of a file without decoding it into one string. ASCII
+    files are memory-mapped and normalized as bytes, any other file is
+    normalized chunk by chunk, transliterating only the chunks with non-ASCII
+    characters.
+
+    Args:
+        ifile (str): The file to read.
+        chunk_size (int): The number of characters to read at a time for non-ASCII files.
+
+    Returns:
+        np.ndarray: The letters of the file as positions in alphabet.
+    """
+    if not (os.path.getsize(ifile)):
+        return np.zeros((0,), dtype=np.uint8)
+
+    text_as_bytes = np.memmap(ifile, dtype=np.uint8, mode="r")
+
+    if text_as_bytes.max() < 128:
+        return normalize_text(text_as_bytes)[0]
+
+    def normalize_chunks(input_file) -> np.ndarray:
+        return np.concatenate(
+            [
+                normalize_text(
+                    text_chunk
+                    if text_chunk.isascii()
+                    else replace_non_ascii_with_alike_char(text_chunk)
+                )[0]
+                for text_chunk in read_in_chunks(input_file, chunk_size)
+            ]
+        )
+
+    return file_handler(path=ifile, mode="r", func=normalize_chunks)
+
+
+def vigenere_stream_main(
+    ifile: str, ofile: str, key: List[int], decode: bool, chunk_size: int
+) -> None:
+    """
+    Encode or decode a file with a known key chunk by chunk, so memory use is
+    bounded by the chunk size rather than the file size.
+
+    Args:
+        ifile (str): The input file.
+        ofile (str): The output file.
+        key (List[int]): The key to use.
+        decode (bool): Whether to decode or not.
+        chunk_size (int): The number of characters to read at a time.
+
+    Returns:
+        None: None.
+    """
+    before_text, after_text = output_for_file_around_text(
+        cipher="VIGENERE",
+        key=key_to_string(key),
+        mode="DECODED" if decode else "ENCODED",
+    )
+
+    def write_output(output_file) -> None:
+        output_file.write(before_text)
+        file_handler(
+            path=ifile,
+            mode="r",
+            func=lambda input_file: output_file.writelines(
+                stream_vigenere_coding(
+                    text_chunks=read_in_chunks(input_file, chunk_size),
+                    key=key,
+                    mode=-1 if decode else 1,
+                )
+            ),
+        )
+        output_file.write(after_text)
+
+    if ofile:
+        file_handler(path=ofile, mode="w", func=write_output)
+    else:
+        write_output(sys.stdout)
+        sys.stdout.write("\n")
 
 
 def vigenere_main(
-    text: str, ofile: str, key: str = None, decode: bool = True, **kwargs
+    text: str = None,
+    ofile: str = None,
+    key: str = None,
+    decode: bool = True,
+    ifile: str = None,
+    chunk_size: int = None,
+    memory_map: bool = False,
+    key_length_engine: str = "coincidence",
+    progressive: bool = False,
+    workers: int = 1,
+    refine: bool = False,
+    language: str = "english",
+    cache_dir: str = None,
+    cache_size: int = DEFAULT_CACHE_SIZE,
+    top_k: int = None,
+    **kwargs,
 ) -> None:
     """
     Main function for the vigenere cipher.
@@ -475,23 +1461,84 @@ def vigenere_main(
         ofile (str): The output file.
         key (str): The key to use.
         decode (bool): Whether to decode or not.
+        ifile (str): The input file, read in chunks when chunk_size is given.
+        chunk_size (int): Stream ifile in chunks of this many characters.
+        memory_map (bool): Crack the key from a memory map of ifile and stream the output.
+        key_length_engine (str): The engine used to rank key lengths when cracking.
+        progressive (bool): Crack the key from a prefix of the text once the key
+        length statistics settle.
+        workers (int): The number of processes to crack the key with.
+        refine (bool): Hill climb the cracked key by quadgram fitness.
+        language (str): The language of the text, or AUTO_DETECT_LANGUAGE.
+        cache_dir (str): The directory of the cracked key cache, or None for no cache.
+        cache_size (int): The most keys to keep in the cache.
+        top_k (int): List this many cracked key candidates after the output,
+        decoding with the first, or None to only crack the best key. The
+        candidates are neither refined nor cached.
         **kwargs: The keyword arguments.
 
     Returns:
         None: None.
     """
-
-    if not (text.isascii()):
-        text = replace_non_ascii_with_alike_char(text)
-
-    converted_text = convert_text_to_position_in_alphabet(text)
-
     if key is not None:
         if not (key.isascii()):
             key = replace_non_ascii_with_alike_char(key)
         key = convert_text_to_position_in_alphabet(key)
-    else:
-        key = return_best_key(encrypted_text=converted_text)
+        if not (key.size):
+            raise ValueError("Key has no letters")
+
+    if chunk_size is not None or memory_map:
+        chunk_size = chunk_size or DEFAULT_CHUNK_SIZE
+
+        if key is None:
+            key = crack_key(
+                encrypted_text=read_letters_from_file(
+                    ifile=ifile, chunk_size=chunk_size
+                ),
+                key_length_engine=key_length_engine,
+                progressive=progressive,
+                workers=workers,
+                refine=refine,
+                language=language,
+                cache_dir=cache_dir,
+                cache_size=cache_size,
+            )
+
+        return vigenere_stream_main(
+            ifile=ifile,
+            ofile=ofile,
+            key=key,
+            decode=decode,
+            chunk_size=chunk_size,
+        )
+
+    if not (text.isascii()):
+        text = replace_non_ascii_with_alike_char(text)
+
+    converted_text, letter_mask = normalize_text(text)
+    key_candidates = []
+
+    if key is None and top_k is not None:
+        key_candidates = return_top_key_candidates(
+            encrypted_text=converted_text,
+            top_k=top_k,
+            key_length_engine=key_length_engine,
+            progressive=progressive,
+            workers=workers,
+            language=language,
+        )
+        key = key_candidates[0].key
+    elif key is None:
+        key = crack_key(
+            encrypted_text=converted_text,
+            key_length_engine=key_length_engine,
+            progressive=progressive,
+            workers=workers,
+            refine=refine,
+            language=language,
+            cache_dir=cache_dir,
+            cache_size=cache_size,
+        )
 
     if decode:
         output_for_file = return_output_for_file(
@@ -500,6 +1547,7 @@ def vigenere_main(
             key=key,
             mode_as_word="DECODED",
             mode_as_int=-1,
+            letter_mask=letter_mask,
         )
     else:
         output_for_file = return_output_for_file(
@@ -508,6 +1556,13 @@ def vigenere_main(
             key=key,
             mode_as_word="ENCODED",
             mode_as_int=1,
+            letter_mask=letter_mask,
+        )
+
+    if key_candidates:
+        output_for_file += output_for_key_candidates.format(
+            cipher="VIGENERE",
+            candidates=key_candidates_to_string(key_candidates=key_candidates),
         )
 
     if ofile:
@@ -0,0 +1,505 @@
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+from typing import List, NamedTuple, Tuple
+import numpy as np
+from .language_profiles import (
+    AUTO_DETECT_LANGUAGE,
+    LANGUAGE_LETTER_FREQUENCIES,
+    detect_language,
+)
+from . import vigenere, vigenere_kernels
+from .vigenere import (
+    CHI_SQUARED_LIMIT,
+    DIRECT_COINCIDENCE_MAX_SIZE,
+    IOC_MIN_COLUMN_LENGTH,
+    MAX_KEY_LENGTH,
+    SHIFT_SCORE_MATRICES,
+    normalize_text,
+    prune_possible_keys,
+    replace_non_ascii_with_alike_char,
+    sort_key_lengths_by_index_of_coincidence,
+)
+
+BATCHES_PER_WORKER = 4
+STACK_MAX_SIZE = 1 << 22
+STACK_PADDING = 26
+DIRECT_STACK_COINCIDENCE_MAX_WIDTH = 1 << 8
+
+
+class BatchCrackResult(NamedTuple):
+    """
+    The result of crack_many.
+    """
+
+    keys: List[List[int]]
+    chi_squared_scores: List[float]
+    messages_per_second: float
+
+
+def normalize_messages(ciphertexts: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Normalize every message into one buffer of letters in a single pass.
+
+    Args:
+        ciphertexts (List[str]): The messages to normalize.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: The letters of every message one after
+        another, and the offsets where each message's letters start and end.
+    """
+    ciphertexts = [
+        text if text.isascii() else replace_non_ascii_with_alike_char(text)
+        for text in ciphertexts
+    ]
+    letters, letter_mask = normalize_text("".join(ciphertexts))
+    byte_offsets = np.cumsum([0] + [len(text) for text in ciphertexts])
+    letters_before_byte = np.concatenate(([0], np.cumsum(letter_mask)))
+    return letters, letters_before_byte[byte_offsets]
+
+
+def stack_messages(
+    letters: np.ndarray, starts: np.ndarray, lengths: np.ndarray, width: int
+) -> np.ndarray:
+    """
+    Stack messages into the rows of a matrix, padding each row after the
+    message with STACK_PADDING.
+
+    Args:
+        letters (np.ndarray): The letters of every message one after another.
+        starts (np.ndarray): The start of each message to stack.
+        lengths (np.ndarray): The number of letters in each message, at most width.
+        width (int): The number of columns of the matrix.
+
+    Returns:
+        np.ndarray: A (message, width) matrix of letters.
+    """
+    positions = np.arange(width)[np.newaxis, :]
+    is_letter = positions < lengths[:, np.newaxis]
+    stack = np.full((lengths.size, width), STACK_PADDING, dtype=np.uint8)
+    stack[is_letter] = letters[(starts[:, np.newaxis] + positions)[is_letter]]
+    return stack
+
+
+def count_columns_of_stack(stack: np.ndarray, key_length: int) -> np.ndarray:
+    """
+    Count the letters of every column of every stacked message for one key
+    length with a single bincount.
+
+    Args:
+        stack (np.ndarray): The messages from stack_messages.
+        key_length (int): The length of the key.
+
+    Returns:
+        np.ndarray: A (message, key_length, 26) tensor where [m, i] counts the
+        letters of message m at every position congruent to i modulo key_length.
+    """
+    columns = (
+        np.arange(stack.shape[0])[:, np.newaxis] * key_length
+        + np.arange(stack.shape[1])[np.newaxis, :] % key_length
+    )
+    return np.bincount(
+        (columns * (STACK_PADDING + 1) + stack).ravel(),
+        minlength=stack.shape[0] * key_length * (STACK_PADDING + 1),
+    ).reshape(stack.shape[0], key_length, STACK_PADDING + 1)[:, :, :STACK_PADDING]
+
+
+def count_shifted_coincidences_of_stack(
+    stack: np.ndarray, lengths: np.ndarray
+) -> List[np.ndarray]:
+    """
+    Count the coincidences of every stacked message with itself shifted by every
+    amount, giving the same counts as count_shifted_coincidences. With the numba
+    kernel backend, stacks up to DIRECT_COINCIDENCE_MAX_SIZE wide are counted
+    directly in one kernel call. Otherwise narrow stacks compare every shift of
+    all the rows at once, and wider stacks take one FFT per letter for all the
+    rows, the width being the power of two the FFT of each message is padded
+    to anyway.
+
+    Args:
+        stack (np.ndarray): The messages from stack_messages, with a power of two width.
+        lengths (np.ndarray): The number of letters in each message.
+
+    Returns:
+        List[np.ndarray]: The coincidence counts of each message where index i
+        is shift i + 1.
+    """
+    width = stack.shape[1]
+
+    if vigenere.KERNEL_BACKEND == "numba" and width <= DIRECT_COINCIDENCE_MAX_SIZE:
+        coincidence_count = vigenere_kernels.count_shifted_coincidences_of_rows(
+            stack, lengths
+        )
+    elif width <= DIRECT_STACK_COINCIDENCE_MAX_WIDTH:
+        coincidence_count = np.zeros((stack.shape[0], max(width - 1, 0)))
+
+        for shift in range(1, width):
+            coincidence_count[:, shift - 1] = np.count_nonzero(
+                (stack[:, :-shift] == stack[:, shift:])
+                & (stack[:, shift:] != STACK_PADDING),
+                axis=1,
+            )
+    else:
+        fft_size = 2 * width
+        power_spectrum = np.zeros((stack.shape[0], fft_size // 2 + 1))
+
+        for letter in np.unique(stack[stack != STACK_PADDING]).tolist():
+            letter_spectrum = np.fft.rfft(stack == letter, n=fft_size, axis=1)
+            power_spectrum += np.square(np.abs(letter_spectrum))
+
+        coincidence_count = np.rint(
+            np.fft.irfft(power_spectrum, n=fft_size, axis=1)[:, 1:]
+        )
+
+    return [
+        coincidence_count[row, : max(length - 1, 0)]
+        for row, length in enumerate(lengths.tolist())
+    ]
+
+
+def sort_key_lengths_by_coincidence_gaps(coincidence_count: np.ndarray) -> List[int]:
+    """
+    Rank key lengths by the gaps between high coincidence counts, giving the
+    same order as sort_key_lengths(key_length_counter(coincidence_count)).
+
+    Args:
+        coincidence_count (np.ndarray): The number of coincidences for each shift.
+
+    Returns:
+        List[int]: The gaps sorted first by how often they occur then by length.
+    """
+    positions = np.arange(coincidence_count.size)
+    large_positions = np.flatnonzero(
+        coincidence_count >= 4.0 * (coincidence_count.size - positions) * (1 / 52)
+    )
+    # a large count at position 0 never starts a gap, as in key_length_counter
+    gaps, gap_counts = np.unique(
+        np.diff(large_positions[large_positions > 0]), return_counts=True
+    )
+    return gaps[np.lexsort((gaps, -gap_counts))].tolist()
+
+
+def rank_key_lengths_of_stack(
+    stack: np.ndarray, lengths: np.ndarray, key_length_engine: str
+) -> List[List[int]]:
+    """
+    Rank and prune the possible key lengths of every stacked message from
+    statistics computed for all the messages at once.
+
+    Args:
+        stack (np.ndarray): The messages from stack_messages.
+        lengths (np.ndarray): The number of letters in each message.
+        key_length_engine (str): The name of the engine used to rank key lengths.
+
+    Returns:
+        List[List[int]]: The possible key lengths of each message, most likely first.
+    """
+    if key_length_engine == "coincidence":
+        sorted_key_lengths = [
+            sort_key_lengths_by_coincidence_gaps(coincidence_count)
+            for coincidence_count in count_shifted_coincidences_of_stack(
+                stack=stack, lengths=lengths
+            )
+        ]
+    elif key_length_engine == "ioc":
+        max_key_lengths = np.maximum(
+            np.minimum(MAX_KEY_LENGTH, lengths // IOC_MIN_COLUMN_LENGTH), 1
+        )
+        index_of_coincidence = np.zeros((lengths.size, max_key_lengths.max()))
+
+        for key_length in range(1, max_key_lengths.max() + 1):
+            letter_counts = count_columns_of_stack(stack=stack, key_length=key_length)
+            column_lengths = letter_counts.sum(axis=2)
+            index_of_coincidence[:, key_length - 1] = np.mean(
+                np.sum(letter_counts * (letter_counts - 1), axis=2)
+                / np.maximum(column_lengths * (column_lengths - 1), 1),
+                axis=1,
+            )
+
+        sorted_key_lengths = [
+            sort_key_lengths_by_index_of_coincidence(
+                index_of_coincidence[row, :max_key_length]
+            )
+            for row, max_key_length in enumerate(max_key_lengths.tolist())
+        ]
+    else:
+        raise ValueError("Invalid key length engine specified")
+
+    return [
+        prune_possible_keys(key_lengths) or [1] for key_lengths in sorted_key_lengths
+    ]
+
+
+def score_key_length_of_stack(
+    stack: np.ndarray, lengths: np.ndarray, key_length: int, language: str
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Find the possible key of one key length for every stacked message and the
+    chi squared value of the solution each gives, from their column counts alone.
+
+    Args:
+        stack (np.ndarray): The messages from stack_messages.
+        lengths (np.ndarray): The number of letters in each message.
+        key_length (int): The length of the key.
+        language (str): The language in LANGUAGE_LETTER_FREQUENCIES of the messages.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: A (message, key_length) matrix of possible
+        keys and the chi squared value of each message.
+    """
+    letter_counts = count_columns_of_stack(stack=stack, key_length=key_length)
+    letter_frequencies = letter_counts / np.maximum(
+        letter_counts.sum(axis=2, keepdims=True), 1
+    )
+    possible_keys = np.argmax(
+        letter_frequencies @ SHIFT_SCORE_MATRICES[language], axis=2
+    )
+    observed_frequency = np.take_along_axis(
+        letter_counts,
+        (np.arange(26)[np.newaxis, np.newaxis, :] + possible_keys[:, :, np.newaxis])
+        % 26,
+        axis=2,
+    ).sum(axis=1)
+    expected_frequency = (
+        LANGUAGE_LETTER_FREQUENCIES[language][np.newaxis, :] * lengths[:, np.newaxis]
+    )
+    return possible_keys, np.sum(
+        np.square(observed_frequency - expected_frequency) / expected_frequency,
+        axis=1,
+    )
+
+
+def crack_stacked_messages(
+    stack: np.ndarray,
+    lengths: np.ndarray,
+    key_length_engine: str,
+    language: str = "english",
+) -> List[Tuple[List[int], float]]:
+    """
+    Crack the key of every stacked message. Key lengths are scored in rounds,
+    every message still searching trying its next key length, with one bincount
+    for each key length and language in the round.
+
+    Args:
+        stack (np.ndarray): The messages from stack_messages.
+        lengths (np.ndarray): The number of letters in each message, at least one.
+        key_length_engine (str): The name of the engine used to rank key lengths.
+        language (str): The language of the messages, or AUTO_DETECT_LANGUAGE to
+        detect it for each message.
+
+    Returns:
+        List[Tuple[List[int], float]]: The key and chi squared value of each message.
+    """
+    possible_key_lengths = rank_key_lengths_of_stack(
+        stack=stack, lengths=lengths, key_length_engine=key_length_engine
+    )
+    languages = [language] * lengths.size
+
+    if language == AUTO_DETECT_LANGUAGE:
+        for key_length in set(key_lengths[0] for key_lengths in possible_key_lengths):
+            rows = [
+                row
+                for row, key_lengths in enumerate(possible_key_lengths)
+                if key_lengths[0] == key_length
+            ]
+            for row, letter_counts in zip(
+                rows, count_columns_of_stack(stack=stack[rows], key_length=key_length)
+            ):
+                languages[row] = detect_language(letter_counts=letter_counts)
+
+    best_keys = [[] for _ in range(lengths.size)]
+    best_chi_squared = [float("inf")] * lengths.size
+    searching = list(range(lengths.size))
+    rank = 0
+
+    while searching:
+        groups = {}
+        has_finished = set()
+
+        for row in searching:
+            groups.setdefault(
+                (possible_key_lengths[row][rank], languages[row]), []
+            ).append(row)
+
+        for (key_length, group_language), rows in groups.items():
+            possible_keys, chi_squared_scores = score_key_length_of_stack(
+                stack=stack[rows],
+                lengths=lengths[rows],
+                key_length=key_length,
+                language=group_language,
+            )
+
+            for row, possible_key, chi_squared_score in zip(
+                rows, possible_keys.tolist(), chi_squared_scores.tolist()
+            ):
+                if chi_squared_score < best_chi_squared[row]:
+                    best_chi_squared[row] = chi_squared_score
+                    best_keys[row] = possible_key
+
+                if (chi_squared_score / lengths[row]) < CHI_SQUARED_LIMIT:
+                    has_finished.add(row)
+
+        rank += 1
+        searching = [
+            row
+            for row in searching
+            if not (row in has_finished) and rank < len(possible_key_lengths[row])
+        ]
+
+    return list(zip(best_keys, best_chi_squared))
+
+
+def crack_messages(
+    letters: np.ndarray,
+    letter_offsets: List[Tuple[int, int]],
+    key_length_engine: str,
+    language: str = "english",
+) -> List[Tuple[List[int], float]]:
+    """
+    Crack the key of each message in a buffer of letters, giving the same keys
+    as return_best_key_and_score would for each message. Messages are stacked by
+    the power of two their length rounds up to, and the coincidence counts,
+    column counts and key scores of each stack are computed for all its messages
+    at once.
+
+    Args:
+        letters (np.ndarray): The letters of every message one after another.
+        letter_offsets (List[Tuple[int, int]]): The start and end of each message.
+        key_length_engine (str): The name of the engine used to rank key lengths.
+        language (str): The language of the messages, or AUTO_DETECT_LANGUAGE to
+        detect it for each message.
+
+    Returns:
+        List[Tuple[List[int], float]]: The key and chi squared value of each
+        message, with an empty key for messages without letters.
+    """
+    results = [([], float("inf")) for _ in letter_offsets]
+    offsets = np.array(letter_offsets, dtype=np.int64).reshape(-1, 2)
+    lengths = offsets[:, 1] - offsets[:, 0]
+    widths = np.array([1 << int(length - 1).bit_length() for length in lengths])
+
+    for width in np.unique(widths[lengths > 0]).tolist():
+        message_indices = np.flatnonzero((widths == width) & (lengths > 0))
+        rows_per_stack = max(STACK_MAX_SIZE // width, 1)
+
+        for first in range(0, message_indices.size, rows_per_stack):
+            stack_indices = message_indices[first : first + rows_per_stack]
+            stack_results = crack_stacked_messages(
+                stack=stack_messages(
+                    letters=letters,
+                    starts=offsets[stack_indices, 0],
+                    lengths=lengths[stack_indices],
+                    width=width,
+                ),
+                lengths=lengths[stack_indices],
+                key_length_engine=key_length_engine,
+                language=language,
+            )
+
+            for message_index, result in zip(stack_indices.tolist(), stack_results):
+                results[message_index] = result
+
+    return results
+
+
+def crack_messages_in_shared_memory(
+    shared_memory_name: str,
+    text_size: int,
+    letter_offsets: List[Tuple[int, int]],
+    key_length_engine: str,
+    language: str,
+) -> List[Tuple[List[int], float]]:
+    """
+    Crack the key of each message held in shared memory, for use in a worker process.
+
+    Args:
+        shared_memory_name (str): The name of the shared memory holding the letters.
+        text_size (int): The number of letters in the shared memory.
+        letter_offsets (List[Tuple[int, int]]): The start and end of each message.
+        key_length_engine (str): The name of the engine used to rank key lengths.
+        language (str): The language of the messages, or AUTO_DETECT_LANGUAGE.
+
+    Returns:
+        List[Tuple[List[int], float]]: The key and chi squared value of each message.
+    """
+    shared_memory = SharedMemory(name=shared_memory_name)
+
+    try:
+        return crack_messages(
+            letters=np.ndarray((text_size,), dtype=np.uint8, buffer=shared_memory.buf),
+            letter_offsets=letter_offsets,
+            key_length_engine=key_length_engine,
+            language=language,
+        )
+    finally:
+        shared_memory.close()
+
+
+def crack_many(
+    ciphertexts: List[str],
+    key_length_engine: str = "coincidence",
+    workers: int = 1,
+    language: str = "english",
+) -> BatchCrackResult:
+    """
+    Crack the vigenere key of many messages in one call. The messages are
+    normalized together into one buffer which worker processes read from
+    shared memory, each cracking a contiguous batch of messages.
+
+    Args:
+        ciphertexts (List[str]): The messages to crack.
+        key_length_engine (str): The name of the engine used to rank key lengths.
+        workers (int): The number of worker processes.
+        language (str): The language of the messages, or AUTO_DETECT_LANGUAGE to
+        detect it for each message.
+
+    Returns:
+        BatchCrackResult: The keys and chi squared values in the order of
+        ciphertexts, and the number of messages cracked per second.
+    """
+    begin_time = time.perf_counter()
+    letters, letter_offsets = normalize_messages(ciphertexts)
+    message_offsets = list(
+        zip(letter_offsets[:-1].tolist(), letter_offsets[1:].tolist())
+    )
+
+    if workers > 1 and len(message_offsets) > 1:
+        batch_size = -(-len(message_offsets) // (workers * BATCHES_PER_WORKER))
+        shared_memory = SharedMemory(create=True, size=max(letters.size, 1))
+
+        try:
+            np.copyto(
+                np.ndarray((letters.size,), dtype=np.uint8, buffer=shared_memory.buf),
+                letters,
+            )
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = [
+                    executor.submit(
+                        crack_messages_in_shared_memory,
+                        shared_memory.name,
+                        letters.size,
+                        message_offsets[start : start + batch_size],
+                        key_length_engine,
+                        language,
+                    )
+                    for start in range(0, len(message_offsets), batch_size)
+                ]
+                results = [result for future in futures for result in future.result()]
+        finally:
+            shared_memory.close()
+            shared_memory.unlink()
+    else:
+        results = crack_messages(
+            letters=letters,
+            letter_offsets=message_offsets,
+            key_length_engine=key_length_engine,
+            language=language,
+        )
+
+    elapsed_time = time.perf_counter() - begin_time
+
+    return BatchCrackResult(
+        keys=[key for key, _ in results],
+        chi_squared_scores=[chi_squared_score for _, chi_squared_score in results],
+        messages_per_second=len(ciphertexts) / elapsed_time if elapsed_time else 0.0,
+    )
@@ -0,0 +1,293 @@
+from typing import List, Tuple
+import numpy as np
+from .language_profiles import (
+    AUTO_DETECT_LANGUAGE,
+    LANGUAGE_LETTER_FREQUENCIES,
+    detect_language,
+)
+from .vigenere import (
+    CHI_SQUARED_LIMIT,
+    IOC_MIN_COLUMN_LENGTH,
+    MAX_KEY_LENGTH,
+    SHIFT_SCORE_MATRICES,
+    index_of_coincidence_from_letter_counts,
+    normalize_text,
+    prune_possible_keys,
+    replace_non_ascii_with_alike_char,
+    score_every_shift_for_all_positions,
+    sort_key_lengths_by_index_of_coincidence,
+)
+
+INCREMENTAL_BLOCK_SIZE = 1 << 14
+RANDOM_COINCIDENCE_RATE = 1 / 26
+COINCIDENCE_TOLERANCE = 0.75
+COINCIDENCE_Z_SCORE = 2.0
+
+
+class IncrementalVigenereCracker:
+    """
+    Crack the vigenere key of a ciphertext that arrives in fragments.
+
+    The coincidence count of every shift up to max_key_length and the letter
+    counts of every column of every key length up to max_key_length are kept
+    as letters are appended, so appending costs time proportional to the new
+    letters only and finding the best key costs time independent of the
+    length of the ciphertext.
+    """
+
+    def __init__(
+        self,
+        max_key_length: int = MAX_KEY_LENGTH,
+        key_length_engine: str = "coincidence",
+        language: str = "english",
+    ) -> None:
+        """
+        Args:
+            max_key_length (int): The longest key length to consider.
+            key_length_engine (str): Rank key lengths by the coincidence rate of
+            the shifts that are multiples of the key length taken together with
+            "coincidence", or by the index of coincidence of the columns with "ioc".
+            language (str): The language of the text, or AUTO_DETECT_LANGUAGE.
+        """
+        if key_length_engine not in ("coincidence", "ioc"):
+            raise ValueError("Invalid key length engine specified")
+
+        self.max_key_length = max_key_length
+        self.key_length_engine = key_length_engine
+        self.language = language
+        self.size = 0
+        self.coincidence_count = np.zeros(max_key_length, dtype=np.int64)
+        self.tail_letters = np.zeros(0, dtype=np.uint8)
+        key_lengths = np.arange(1, max_key_length + 1)
+        self.column_count_offsets = 26 * (key_lengths * (key_lengths - 1) // 2)
+        self.column_counts = np.zeros(
+            26 * max_key_length * (max_key_length + 1) // 2, dtype=np.int64
+        )
+
+    def append(self, letters: np.ndarray) -> None:
+        """
+        Add letters to the end of the ciphertext and update the statistics.
+
+        Args:
+            letters (np.ndarray): The new letters as positions in alphabet.
+
+        Returns:
+            None: None.
+        """
+        for start in range(0, letters.size, INCREMENTAL_BLOCK_SIZE):
+            self.append_block(letters[start : start + INCREMENTAL_BLOCK_SIZE])
+
+    def append_text(self, text: str) -> None:
+        """
+        Add the letters of some text to the end of the ciphertext.
+
+        Args:
+            text (str): The new text, anything other than letters being ignored.
+
+        Returns:
+            None: None.
+        """
+        if not (text.isascii()):
+            text = replace_non_ascii_with_alike_char(text)
+
+        self.append(normalize_text(text)[0])
+
+    def append_block(self, letters: np.ndarray) -> None:
+        """
+        Update the statistics with a block of letters small enough to index at once.
+
+        Args:
+            letters (np.ndarray): The new letters as positions in alphabet.
+
+        Returns:
+            None: None.
+        """
+        letters = letters.astype(np.uint8)
+        recent_letters = np.concatenate((self.tail_letters, letters))
+        first_new = self.tail_letters.size
+
+        for shift in range(1, self.max_key_length + 1):
+            start = max(first_new, shift)
+            self.coincidence_count[shift - 1] += np.count_nonzero(
+                recent_letters[start:] == recent_letters[start - shift : -shift]
+            )
+
+        key_lengths = np.arange(1, self.max_key_length + 1)[:, np.newaxis]
+        positions = np.arange(self.size, self.size + letters.size)[np.newaxis, :]
+        self.column_counts += np.bincount(
+            (
+                self.column_count_offsets[:, np.newaxis]
+                + (positions % key_lengths) * 26
+                + letters[np.newaxis, :]
+            ).ravel(),
+            minlength=self.column_counts.size,
+        )
+        self.size += letters.size
+        self.tail_letters = recent_letters[-self.max_key_length :]
+
+    def letter_counts(self, key_length: int) -> np.ndarray:
+        """
+        Return the letter counts of every column for a key length.
+
+        Args:
+            key_length (int): The length of the key.
+
+        Returns:
+            np.ndarray: A (key_length, 26) matrix where row i counts the letters
+            at every position congruent to i modulo key_length.
+        """
+        offset = self.column_count_offsets[key_length - 1]
+        return self.column_counts[offset : offset + 26 * key_length].reshape(
+            key_length, 26
+        )
+
+    def sorted_possible_key_lengths(self) -> List[int]:
+        """
+        Rank the key lengths, leaving out those with columns too short to trust.
+
+        Returns:
+            List[int]: The possible key lengths, most likely first.
+        """
+        max_key_length = max(
+            min(self.max_key_length, self.size // IOC_MIN_COLUMN_LENGTH), 1
+        )
+
+        if self.key_length_engine == "coincidence":
+            return self.sort_key_lengths_by_coincidence_rate(
+                max_key_length=max_key_length
+            )
+
+        return sort_key_lengths_by_index_of_coincidence(
+            np.array(
+                [
+                    index_of_coincidence_from_letter_counts(
+                        self.letter_counts(key_length)
+                    )
+                    for key_length in range(1, max_key_length + 1)
+                ]
+            )
+        )
+
+    def sort_key_lengths_by_coincidence_rate(self, max_key_length: int) -> List[int]:
+        """
+        Sort the key lengths by the coincidence rate of the shifts that are
+        multiples of each key length taken together. Key lengths whose excess
+        over the random coincidence rate is, within COINCIDENCE_Z_SCORE standard
+        errors, close to the largest excess come first from shortest to longest,
+        then the rest from highest rate to lowest.
+
+        Args:
+            max_key_length (int): The longest key length to rank.
+
+        Returns:
+            List[int]: The key lengths sorted.
+        """
+        comparison_count = np.maximum(
+            self.size - np.arange(1, self.max_key_length + 1), 0
+        )
+        key_lengths = range(1, max_key_length + 1)
+        coincidences = np.array(
+            [
+                self.coincidence_count[key_length - 1 :: key_length].sum()
+                for key_length in key_lengths
+            ]
+        )
+        comparisons = np.array(
+            [
+                max(comparison_count[key_length - 1 :: key_length].sum(), 1)
+                for key_length in key_lengths
+            ]
+        )
+        coincidence_rate = coincidences / comparisons
+        excess_rate = coincidence_rate - RANDOM_COINCIDENCE_RATE
+        standard_error = np.sqrt(
+            coincidence_rate * (1 - coincidence_rate) / comparisons
+        )
+        is_close_to_best = (
+            excess_rate + COINCIDENCE_Z_SCORE * standard_error
+            >= COINCIDENCE_TOLERANCE * np.max(excess_rate)
+        )
+        other_key_lengths = np.flatnonzero(~is_close_to_best)
+        other_key_lengths = other_key_lengths[
+            np.argsort(-coincidence_rate[other_key_lengths], kind="stable")
+        ]
+        return (
+            np.concatenate((np.flatnonzero(is_close_to_best), other_key_lengths)) + 1
+        ).tolist()
+
+    def score_key_length(
+        self, key_length: int, language: str
+    ) -> Tuple[List[int], float]:
+        """
+        Find the possible key for a key length and the chi squared value of the
+        solution it gives, from the letter counts alone.
+
+        Args:
+            key_length (int): The length of the key.
+            language (str): The language in LANGUAGE_LETTER_FREQUENCIES of the text.
+
+        Returns:
+            Tuple[List[int], float]: The possible key and its chi squared value.
+        """
+        letter_counts = self.letter_counts(key_length)
+        possible_key = np.argmax(
+            score_every_shift_for_all_positions(
+                letter_counts=letter_counts,
+                shift_score_matrix=SHIFT_SCORE_MATRICES[language],
+            ),
+            axis=1,
+        )
+        alphabet = np.arange(26)
+        observed_frequency = letter_counts[
+            np.arange(key_length)[:, np.newaxis],
+            (alphabet[np.newaxis, :] + possible_key[:, np.newaxis]) % 26,
+        ].sum(axis=0)
+        expected_frequency = LANGUAGE_LETTER_FREQUENCIES[language] * self.size
+        return possible_key.tolist(), np.sum(
+            np.square(observed_frequency - expected_frequency) / expected_frequency
+        )
+
+    def best_key_and_score(self) -> Tuple[List[int], float]:
+        """
+        Return the most likely key for the ciphertext so far and the chi
+        squared value of its solution.
+
+        Returns:
+            Tuple[List[int], float]: The best key and its chi squared value, or an
+            empty key if there are no letters yet.
+        """
+        if not self.size:
+            return [], float("inf")
+
+        possible_key_lengths = prune_possible_keys(self.sorted_possible_key_lengths())
+        language = self.language
+
+        if language == AUTO_DETECT_LANGUAGE:
+            language = detect_language(
+                letter_counts=self.letter_counts(possible_key_lengths[0])
+            )
+
+        best_chi_squared = float("inf")
+
+        for key_length in possible_key_lengths:
+            possible_key, chi_squared_score = self.score_key_length(
+                key_length=key_length, language=language
+            )
+
+            if chi_squared_score < best_chi_squared:
+                best_chi_squared = chi_squared_score
+                best_key = possible_key
+
+            if (chi_squared_score / self.size) < CHI_SQUARED_LIMIT:
+                break
+
+        return best_key, best_chi_squared
+
+    def best_key(self) -> List[int]:
+        """
+        Return the most likely key for the ciphertext so far.
+
+        Returns:
+            List[int]: The best key.
+        """
+        return self.best_key_and_score()[0]
@@ -0,0 +1,113 @@
+import numpy as np
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+NUMBA_AVAILABLE = numba is not None
+
+if NUMBA_AVAILABLE:
+
+    @numba.njit(cache=True, nogil=True)
+    def count_shifted_coincidences(encrypted_text: np.ndarray) -> np.ndarray:
+        """
+        Count the coincidences of the text with itself shifted by every amount,
+        comparing every pair of letters directly in O(n^2).
+
+        Args:
+            encrypted_text (np.ndarray): The encrypted text as uint8 letters.
+
+        Returns:
+            np.ndarray: The number of coincidences where index i is shift i + 1.
+        """
+        size = encrypted_text.size
+        coincidence_count = np.zeros(max(size - 1, 0), dtype=np.float64)
+
+        for shift in range(1, size):
+            count = 0
+            for pos in range(size - shift):
+                count += encrypted_text[pos] == encrypted_text[pos + shift]
+            coincidence_count[shift - 1] = count
+
+        return coincidence_count
+
+    @numba.njit(cache=True, nogil=True)
+    def count_shifted_coincidences_of_rows(
+        stack: np.ndarray, lengths: np.ndarray
+    ) -> np.ndarray:
+        """
+        Count the coincidences of every row of a matrix of messages with itself
+        shifted by every amount, comparing every pair of letters directly.
+
+        Args:
+            stack (np.ndarray): A (message, width) matrix of uint8 letters.
+            lengths (np.ndarray): The number of letters at the start of each row.
+
+        Returns:
+            np.ndarray: A (message, width - 1) matrix where [m, i] is the number
+            of coincidences of message m for shift i + 1.
+        """
+        rows, width = stack.shape
+        coincidence_count = np.zeros((rows, max(width - 1, 0)), dtype=np.float64)
+
+        for row in range(rows):
+            size = lengths[row]
+            for shift in range(1, size):
+                count = 0
+                for pos in range(size - shift):
+                    count += stack[row, pos] == stack[row, pos + shift]
+                coincidence_count[row, shift - 1] = count
+
+        return coincidence_count
+
+    @numba.njit(cache=True, nogil=True)
+    def count_of_every_nth_letter_for_all_positions(
+        encrypted_text: np.ndarray, n: int
+    ) -> np.ndarray:
+        """
+        Count the letters of every column of the text for a key length of n.
+
+        Args:
+            encrypted_text (np.ndarray): The text as uint8 letters.
+            n (int): The nth letter to count.
+
+        Returns:
+            np.ndarray: A (n, 26) matrix where row i counts the letters at every
+            position congruent to i modulo n.
+        """
+        letter_counts = np.zeros((n, 26), dtype=np.int64)
+        column = 0
+
+        for letter in encrypted_text:
+            letter_counts[column, letter] += 1
+            column += 1
+            if column == n:
+                column = 0
+
+        return letter_counts
+
+    @numba.njit(cache=True, nogil=True)
+    def apply_key(text: np.ndarray, key: np.ndarray, mode: int) -> np.ndarray:
+        """
+        Apply the key to the text letter by letter.
+
+        Args:
+            text (np.ndarray): The text as uint8 letters.
+            key (np.ndarray): The key as int64 letters.
+            mode (int): The mode -1 being decrypt, 1 being encrypt.
+
+        Returns:
+            np.ndarray: The text with the key applied as uint8 letters.
+        """
+        applied_text = np.empty(text.size, dtype=np.uint8)
+        key_length = key.size
+        key_pos = 0
+
+        for pos in range(text.size):
+            applied_text[pos] = (text[pos] + mode * key[key_pos]) % 26
+            key_pos += 1
+            if key_pos == key_length:
+                key_pos = 0
+
+        return applied_text
@@ -3,6 +3,10 @@ import os
 import sys
 from typing import List
 from cipher_modules_map import cipher_modules_map
+from ciphers.feistel import BLOCK_MODES, BLOCK_SIZES, DEFAULT_BLOCK_SIZE
+from ciphers.key_cache import DEFAULT_CACHE_SIZE
+from ciphers.language_profiles import AUTO_DETECT_LANGUAGE, LANGUAGES
+from ciphers.vigenere import KEY_LENGTH_ENGINES
 from ciphers.utils import file_handler
 
 
@@ -51,6 +55,114 @@ def parse_args(args) -> argparse.Namespace:
         default=4,
         help="number of blocks to use for feistel cipher (default=4)",
     )
+    parser.add_argument(
+        "--chunk_size",
+        type=int,
+        default=None,
+        help=(
+            "stream the input file in chunks of this many characters (default=None) "
+            "Note: streaming needs a key, and a block mode for feistel cipher, and "
+            "keeps memory use bounded by the chunk size"
+        ),
+    )
+    parser.add_argument(
+        "--block_mode",
+        type=str,
+        default=None,
+        help=(
+            "code the feistel cipher in fixed size blocks with one small subkey "
+            f"schedule, one of {', '.join(BLOCK_MODES)} (default=None) "
+            "Note: ctr writes a random nonce before the encoded text"
+        ),
+    )
+    parser.add_argument(
+        "--block_size",
+        type=int,
+        default=DEFAULT_BLOCK_SIZE,
+        help=(
+            "block size in bits for the feistel block mode, one of "
+            f"{', '.join(map(str, BLOCK_SIZES))} (default={DEFAULT_BLOCK_SIZE})"
+        ),
+    )
+    parser.add_argument(
+        "--key_length_engine",
+        type=str,
+        default="coincidence",
+        help=(
+            "engine used to find the vigenere key length when cracking, either "
+            "coincidence or ioc (default=coincidence)"
+        ),
+    )
+    parser.add_argument(
+        "--progressive",
+        type=str,
+        default="False",
+        help=(
+            "crack the vigenere key from growing prefixes of the input, stopping "
+            "once the best key length stops changing (default=False)"
+        ),
+    )
+    parser.add_argument(
+        "--refine",
+        type=str,
+        default="False",
+        help=(
+            "hill climb the cracked vigenere key by english quadgram fitness to fix "
+            "wrong letters on short english texts (default=False)"
+        ),
+    )
+    parser.add_argument(
+        "--language",
+        type=str,
+        default="english",
+        help=(
+            "language of the vigenere plaintext used when cracking the key, one of "
+            f"{', '.join(LANGUAGES)} or {AUTO_DETECT_LANGUAGE} to detect it "
+            "(default=english)"
+        ),
+    )
+    parser.add_argument(
+        "--top_k",
+        type=int,
+        default=None,
+        help=(
+            "list this many cracked vigenere key candidates with their chi squared "
+            "value and per letter confidence after the output (default=None)"
+        ),
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help=(
+            "number of worker processes to crack the vigenere key with, or of "
+            "threads to code feistel blocks with in block mode (default=1)"
+        ),
+    )
+    parser.add_argument(
+        "--cache_dir",
+        type=str,
+        default=None,
+        help=(
+            "directory to cache cracked vigenere keys in, so decoding the same text "
+            "again skips the key search (default=None)"
+        ),
+    )
+    parser.add_argument(
+        "--cache_size",
+        type=int,
+        default=DEFAULT_CACHE_SIZE,
+        help=f"most keys to keep in the key cache (default={DEFAULT_CACHE_SIZE})",
+    )
+    parser.add_argument(
+        "--memory_map",
+        type=str,
+        default="False",
+        help=(
+            "memory map the input file to crack the vigenere key without reading "
+            "it into memory, then stream the output (default=False)"
+        ),
+    )
 
     return parser.parse_args(args)
 
@@ -68,30 +180,94 @@ def perform_checks(args):
         raise ValueError("Key file does not exist or the path provided is incorrect")
     if args.cipher == "feistel" and args.key is None:
         raise ValueError("No key specified for feistel cipher")
+    if args.chunk_size is not None:
+        if args.chunk_size < 1:
+            raise ValueError("Chunk size must be a positive number of characters")
+        if args.key is None and not (args.memory_map):
+            raise ValueError("No key specified for streaming mode")
+        if args.cipher == "feistel" and args.block_mode is None:
+            raise ValueError("Streaming mode for feistel cipher needs a block mode")
+    if args.cache_size < 1:
+        raise ValueError("Cache size must be at least 1")
+    if args.workers < 1:
+        raise ValueError("Number of workers must be at least 1")
+    if not (args.key_length_engine in KEY_LENGTH_ENGINES):
+        raise ValueError("Invalid key length engine specified")
+    if not (args.language in LANGUAGES or args.language == AUTO_DETECT_LANGUAGE):
+        raise ValueError("Invalid language specified or language is not supported yet")
+    if args.refine and args.language != "english":
+        raise ValueError("Refining the key is only supported for english text")
+    if args.top_k is not None:
+        if args.top_k < 1:
+            raise ValueError("Number of key candidates must be at least 1")
+        if args.cipher != "vigenere":
+            raise ValueError("Key candidates are only supported for vigenere cipher")
+        if args.key is not None:
+            raise ValueError("Key candidates are only listed when cracking the key")
+        if args.chunk_size is not None or args.memory_map:
+            raise ValueError("Key candidates are not supported in streaming mode")
+        if args.refine:
+            raise ValueError("Key candidates are not supported with refine")
+        if args.cache_dir is not None or args.cache_size != DEFAULT_CACHE_SIZE:
+            raise ValueError("Key candidates are not supported with the key cache")
+    if args.block_mode is not None:
+        if args.cipher != "feistel":
+            raise ValueError("Block mode is only supported for feistel cipher")
+        if not (args.block_mode in BLOCK_MODES):
+            raise ValueError("Invalid block mode specified")
+    if not (args.block_size in BLOCK_SIZES):
+        raise ValueError("Invalid block size specified")
+    if args.memory_map and args.cipher != "vigenere":
+        raise ValueError("Memory mapped input is only supported for vigenere cipher")
+
+
+def str_to_bool(value: str) -> bool:
+    return value == "True" or value == "true"
 
 
 def main(args: List[str]) -> None:
     args = parse_args(args)
 
-    if args.decode == "True" or args.decode == "true":
-        args.decode = True
-    else:
-        args.decode = False
+    args.decode = str_to_bool(args.decode)
+    args.memory_map = str_to_bool(args.memory_map)
+    args.progressive = str_to_bool(args.progressive)
+    args.refine = str_to_bool(args.refine)
 
     perform_checks(args)
 
     if args.key:
         args.key = file_handler(path=args.key, mode="r", func=lambda f: f.read())
 
-    cipher_modules_map[args.cipher](
-        **{
-            "text": file_handler(path=args.ifile, mode="r", func=lambda f: f.read()),
-            "ofile": args.ofile,
-            "key": args.key,
-            "decode": args.decode,
-            "num_blocks": args.num_blocks,
-        }
-    )
+    cipher_kwargs = {
+        "ofile": args.ofile,
+        "key": args.key,
+        "decode": args.decode,
+        "num_blocks": args.num_blocks,
+        "block_mode": args.block_mode,
+        "block_size": args.block_size,
+        "ifile": args.ifile,
+        "chunk_size": args.chunk_size,
+        "memory_map": args.memory_map,
+        "key_length_engine": args.key_length_engine,
+        "progressive": args.progressive,
+        "workers": args.workers,
+        "refine": args.refine,
+        "language": args.language,
+        "cache_dir": args.cache_dir,
+        "cache_size": args.cache_size,
+        "top_k": args.top_k,
+    }
+
+    if args.chunk_size is None and not (args.memory_map):
+        # feistel ciphertext may hold any byte, so its newlines are kept as is
+        cipher_kwargs["text"] = file_handler(
+            path=args.ifile,
+            mode="r",
+            func=lambda f: f.read(),
+            newline="" if args.cipher == "feistel" else None,
+        )
+
+    cipher_modules_map[args.cipher](**cipher_kwargs)
 
 
 if __name__ == "__main__":
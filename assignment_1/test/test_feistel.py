@@ -9,6 +9,22 @@ from ciphers.feistel import (
     perform_feistel_coding,
     feistel_main,
     generate_subkeys,
+    generate_packed_subkeys,
+    SUBKEY_CHUNK_BITS,
+    pack_bits,
+    unpack_bits,
+    perform_packed_feistel_coding,
+    apply_linear_rounds,
+    compile_feistel_network,
+    CompiledFeistelNetwork,
+    BLOCK_MODES,
+    BLOCK_SIZES,
+    counter_blocks,
+    pad_block_bytes,
+    unpad_block_bytes,
+    perform_block_feistel_coding,
+    MIN_BLOCKS_PER_WORKER,
+    stream_block_feistel_coding,
 )
 
 default_err_msg = "{} has not returned correct output"
@@ -50,6 +66,28 @@ class feistel_tester(unittest.TestCase):
             err_message="binary_to_text",
         )
 
+    def test_binary_round_trip_every_byte(self):
+        text = "".join(chr(byte) for byte in range(256))
+        self.assertEqual(
+            text_to_binary(text).size,
+            8 * len(text),
+            default_err_msg.format("text_to_binary"),
+        )
+        self.assertEqual(
+            binary_to_text(text_to_binary(text)),
+            text,
+            default_err_msg.format("binary_to_text"),
+        )
+
+    def test_text_to_binary_non_latin_1(self):
+        with self.assertWarns(Warning):
+            binary = text_to_binary("it\u2019s H\u00e8llo")
+        self.assertEqual(
+            binary_to_text(binary),
+            "it's H\u00e8llo",
+            default_err_msg.format("text_to_binary"),
+        )
+
     def test_split_into_left_right_blocks(self):
         left, right = np.split(text_to_binary(simple_pharse), 2)
         self.assertEqual(
@@ -150,6 +188,294 @@ class feistel_tester(unittest.TestCase):
             err_message=default_err_msg.format("perform_feistel_encoding"),
         )
 
+    def test_pack_and_unpack_bits(self):
+        binary = np.random.default_rng(0).integers(2, size=(3, 70), dtype=np.uint8)
+        packed = pack_bits(binary)
+        self.assertEqual(
+            (packed.dtype, packed.shape),
+            (np.dtype(np.uint64), (3, 2)),
+            default_err_msg.format("pack_bits"),
+        )
+        self.numpy_array_equality_tester(
+            func=unpack_bits,
+            func_kwargs={"words": packed, "length": 70},
+            expected_array=binary,
+            err_message=default_err_msg.format("unpack_bits"),
+        )
+
+    def test_generate_packed_subkeys(self):
+        for length in (4, 13, 160):
+            self.numpy_array_equality_tester(
+                func=generate_packed_subkeys,
+                func_kwargs={"secret_key": 5, "length": length, "num_blocks": 3},
+                expected_array=pack_bits(
+                    generate_subkeys(secret_key=5, length=length, num_blocks=3)
+                ),
+                err_message=default_err_msg.format("generate_packed_subkeys"),
+            )
+
+    def test_generate_packed_subkeys_across_chunks(self):
+        # 400004 bit rows give chunks of two rows, so five rows take three draws
+        self.assertLess(2 * 400004, SUBKEY_CHUNK_BITS)
+        self.assertGreater(3 * 400004, SUBKEY_CHUNK_BITS)
+        self.numpy_array_equality_tester(
+            func=generate_packed_subkeys,
+            func_kwargs={"secret_key": 5, "length": 400004, "num_blocks": 5},
+            expected_array=pack_bits(
+                generate_subkeys(secret_key=5, length=400004, num_blocks=5)
+            ),
+            err_message=default_err_msg.format("generate_packed_subkeys"),
+        )
+
+    def test_perform_packed_feistel_coding(self):
+        text_as_binary = text_to_binary(brown_fox_text)
+        length = text_as_binary.size // 2
+        self.numpy_array_equality_tester(
+            func=perform_packed_feistel_coding,
+            func_kwargs={
+                "text_as_binary": text_as_binary,
+                "packed_subkeys": generate_packed_subkeys(
+                    secret_key=1, length=length, num_blocks=5
+                ),
+            },
+            expected_array=perform_feistel_coding(
+                text_as_binary=text_as_binary,
+                subkeys=generate_subkeys(secret_key=1, length=length, num_blocks=5),
+            ),
+            err_message=default_err_msg.format("perform_packed_feistel_coding"),
+        )
+
+    def test_apply_linear_rounds(self):
+        left, right = np.array([1, 0, 1, 0]), np.array([1, 1, 0, 0])
+        zero_subkeys = np.zeros((7, 4), dtype=np.uint8)
+        for num_rounds in range(7):
+            expected_right, expected_left = np.split(
+                perform_feistel_coding(
+                    text_as_binary=np.concatenate((left, right)),
+                    subkeys=zero_subkeys[:num_rounds],
+                ),
+                2,
+            )
+            self.numpy_array_equality_tester(
+                func=apply_linear_rounds,
+                func_kwargs={"left": left, "right": right, "num_rounds": num_rounds},
+                expected_array=np.array([expected_left, expected_right]),
+                err_message=default_err_msg.format("apply_linear_rounds"),
+            )
+
+    def test_compiled_feistel_network(self):
+        text_as_binary = text_to_binary(brown_fox_text)
+        length = text_as_binary.size // 2
+        for num_blocks in range(8):
+            subkeys = generate_subkeys(
+                secret_key=1, length=length, num_blocks=num_blocks
+            )
+            network = CompiledFeistelNetwork(pack_bits(subkeys))
+            self.numpy_array_equality_tester(
+                func=network.code,
+                func_kwargs={"text_as_binary": text_as_binary},
+                expected_array=perform_feistel_coding(text_as_binary, subkeys),
+                err_message=default_err_msg.format("CompiledFeistelNetwork encode"),
+            )
+            self.numpy_array_equality_tester(
+                func=network.code,
+                func_kwargs={
+                    "text_as_binary": network.code(text_as_binary),
+                    "decode": True,
+                },
+                expected_array=text_as_binary,
+                err_message=default_err_msg.format("CompiledFeistelNetwork decode"),
+            )
+
+    def test_compile_feistel_network_is_cached(self):
+        self.assertIs(
+            compile_feistel_network(secret_key=1, length=8, num_blocks=100),
+            compile_feistel_network(secret_key=1, length=8, num_blocks=100),
+            default_err_msg.format("compile_feistel_network"),
+        )
+
+    def test_pad_and_unpad_block_bytes(self):
+        data = np.frombuffer(b"abcde", dtype=np.uint8)
+        padded = pad_block_bytes(data=data, block_bytes=8)
+        self.assertEqual(
+            padded.tobytes(), b"abcde\x03\x03\x03", default_err_msg.format("pad")
+        )
+        self.assertEqual(
+            pad_block_bytes(data=padded, block_bytes=8).size,
+            16,
+            default_err_msg.format("pad_block_bytes"),
+        )
+        self.numpy_array_equality_tester(
+            func=unpad_block_bytes,
+            func_kwargs={"data": padded, "block_bytes": 8},
+            expected_array=data,
+            err_message=default_err_msg.format("unpad_block_bytes"),
+        )
+        with self.assertRaises(ValueError):
+            unpad_block_bytes(data=padded[:-1], block_bytes=8)
+        with self.assertRaises(ValueError):
+            unpad_block_bytes(
+                data=np.frombuffer(b"abcde\x03\x02\x03", dtype=np.uint8),
+                block_bytes=8,
+            )
+
+    def test_counter_blocks(self):
+        self.numpy_array_equality_tester(
+            func=counter_blocks,
+            func_kwargs={
+                "nonce": np.array([7, 8, 9, 10], dtype=np.uint8),
+                "block_count": 2,
+                "start": 255,
+            },
+            expected_array=np.array(
+                [[7, 8, 9, 10, 0, 0, 0, 255], [7, 8, 9, 10, 0, 0, 1, 0]]
+            ),
+            err_message=default_err_msg.format("counter_blocks"),
+        )
+        nonce = np.zeros(4, dtype=np.uint8)
+        with self.subTest(default_err_msg.format("counter_blocks last counter")):
+            np.testing.assert_equal(
+                counter_blocks(nonce=nonce, block_count=1, start=2**32 - 1),
+                [[0, 0, 0, 0, 255, 255, 255, 255]],
+            )
+        with self.assertRaises(ValueError):
+            counter_blocks(nonce=nonce, block_count=2, start=2**32 - 1)
+
+    def test_code_blocks(self):
+        for block_size in BLOCK_SIZES:
+            subkeys = generate_subkeys(
+                secret_key=3, length=block_size // 2, num_blocks=5
+            )
+            network = CompiledFeistelNetwork(pack_bits(subkeys))
+            blocks = np.random.default_rng(0).integers(
+                256, size=(4, block_size // 8), dtype=np.uint8
+            )
+            self.numpy_array_equality_tester(
+                func=network.code_blocks,
+                func_kwargs={"blocks": blocks},
+                expected_array=np.array(
+                    [
+                        np.packbits(
+                            perform_feistel_coding(np.unpackbits(block), subkeys)
+                        )
+                        for block in blocks
+                    ]
+                ),
+                err_message=default_err_msg.format("code_blocks"),
+            )
+
+    def test_perform_block_feistel_coding(self):
+        data = np.frombuffer(brown_fox_text.encode("latin-1"), dtype=np.uint8)
+        for block_mode in BLOCK_MODES:
+            for block_size in BLOCK_SIZES:
+                network = compile_feistel_network(
+                    secret_key=3, length=block_size // 2, num_blocks=5
+                )
+                encoded = perform_block_feistel_coding(
+                    data=data,
+                    network=network,
+                    block_mode=block_mode,
+                    block_size=block_size,
+                    decode=False,
+                )
+                self.numpy_array_equality_tester(
+                    func=perform_block_feistel_coding,
+                    func_kwargs={
+                        "data": encoded,
+                        "network": network,
+                        "block_mode": block_mode,
+                        "block_size": block_size,
+                        "decode": True,
+                    },
+                    expected_array=data,
+                    err_message=default_err_msg.format(
+                        f"perform_block_feistel_coding {block_mode} {block_size}"
+                    ),
+                )
+
+    def test_code_blocks_with_workers(self):
+        network = compile_feistel_network(secret_key=3, length=32, num_blocks=5)
+        blocks = np.random.default_rng(0).integers(
+            256, size=(4 * MIN_BLOCKS_PER_WORKER + 3, 8), dtype=np.uint8
+        )
+        for decode in (False, True):
+            self.numpy_array_equality_tester(
+                func=network.code_blocks,
+                func_kwargs={"blocks": blocks, "decode": decode, "workers": 4},
+                expected_array=network.code_blocks(blocks, decode=decode),
+                err_message=default_err_msg.format("code_blocks"),
+            )
+
+    def test_stream_block_feistel_coding(self):
+        data = np.frombuffer(brown_fox_text.encode("latin-1"), dtype=np.uint8)
+        network = compile_feistel_network(secret_key=3, length=32, num_blocks=5)
+        encoded = perform_block_feistel_coding(
+            data=data, network=network, block_mode="ecb", block_size=64, decode=False
+        )
+        for chunk_size in (1, 3, 8, 13, data.size + 1):
+            data_chunks = [
+                data[start : start + chunk_size]
+                for start in range(0, data.size, chunk_size)
+            ]
+            self.numpy_array_equality_tester(
+                func=lambda **kwargs: np.concatenate(
+                    list(stream_block_feistel_coding(**kwargs))
+                ),
+                func_kwargs={
+                    "data_chunks": data_chunks,
+                    "network": network,
+                    "block_mode": "ecb",
+                    "block_size": 64,
+                    "decode": False,
+                },
+                expected_array=encoded,
+                err_message=default_err_msg.format("stream_block_feistel_coding"),
+            )
+            for block_mode in BLOCK_MODES:
+                encoded_chunks = list(
+                    stream_block_feistel_coding(
+                        data_chunks=data_chunks,
+                        network=network,
+                        block_mode=block_mode,
+                        block_size=64,
+                        decode=False,
+                    )
+                )
+                self.numpy_array_equality_tester(
+                    func=perform_block_feistel_coding,
+                    func_kwargs={
+                        "data": np.concatenate(encoded_chunks),
+                        "network": network,
+                        "block_mode": block_mode,
+                        "block_size": 64,
+                        "decode": True,
+                    },
+                    expected_array=data,
+                    err_message=default_err_msg.format(
+                        f"stream_block_feistel_coding {block_mode}"
+                    ),
+                )
+                stream_encoded = np.concatenate(encoded_chunks)
+                self.numpy_array_equality_tester(
+                    func=lambda **kwargs: np.concatenate(
+                        list(stream_block_feistel_coding(**kwargs))
+                    ),
+                    func_kwargs={
+                        "data_chunks": [
+                            stream_encoded[start : start + chunk_size]
+                            for start in range(0, stream_encoded.size, chunk_size)
+                        ],
+                        "network": network,
+                        "block_mode": block_mode,
+                        "block_size": 64,
+                        "decode": True,
+                    },
+                    expected_array=data,
+                    err_message=default_err_msg.format(
+                        f"stream_block_feistel_coding {block_mode}"
+                    ),
+                )
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,96 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from ciphers.key_cache import cache_entry_path, load_cached_key, store_cached_key
+from ciphers.vigenere import crack_key, ENGINE_VERSION
+
+default_err_msg = "{} has not returned correct output"
+test_letters = np.array([10, 23, 16, 14, 25], dtype=np.uint8)
+
+
+class key_cache_tester(unittest.TestCase):
+    def setUp(self):
+        self.cache_directory = tempfile.TemporaryDirectory()
+        self.cache_dir = self.cache_directory.name
+
+    def tearDown(self):
+        self.cache_directory.cleanup()
+
+    def test_store_and_load_cached_key(self):
+        store_cached_key(
+            cache_dir=self.cache_dir,
+            letters=test_letters,
+            key=[10, 4, 24],
+            chi_squared=12.5,
+            engine_version="1",
+        )
+        self.assertEqual(
+            load_cached_key(
+                cache_dir=self.cache_dir, letters=test_letters, engine_version="1"
+            ),
+            ([10, 4, 24], 12.5),
+            default_err_msg.format("load_cached_key"),
+        )
+
+    def test_load_cached_key_other_engine_version(self):
+        store_cached_key(
+            cache_dir=self.cache_dir,
+            letters=test_letters,
+            key=[10, 4, 24],
+            chi_squared=12.5,
+            engine_version="1",
+        )
+        self.assertIsNone(
+            load_cached_key(
+                cache_dir=self.cache_dir, letters=test_letters, engine_version="2"
+            ),
+            default_err_msg.format("load_cached_key"),
+        )
+
+    def test_store_cached_key_evicts_least_recently_used(self):
+        letters = [test_letters + shift for shift in range(3)]
+
+        for pos, entry_letters in enumerate(letters):
+            store_cached_key(
+                cache_dir=self.cache_dir,
+                letters=entry_letters,
+                key=[pos],
+                chi_squared=0.0,
+                engine_version="1",
+                cache_size=2,
+            )
+            entry_path = cache_entry_path(
+                cache_dir=self.cache_dir, letters=entry_letters
+            )
+            os.utime(entry_path, (pos, pos))
+
+        self.assertFalse(
+            os.path.exists(
+                cache_entry_path(cache_dir=self.cache_dir, letters=letters[0])
+            ),
+            default_err_msg.format("store_cached_key"),
+        )
+        self.assertEqual(
+            len(os.listdir(self.cache_dir)),
+            2,
+            default_err_msg.format("store_cached_key"),
+        )
+
+    def test_crack_key_uses_cache(self):
+        store_cached_key(
+            cache_dir=self.cache_dir,
+            letters=test_letters,
+            key=[1, 2],
+            chi_squared=0.0,
+            engine_version=f"{ENGINE_VERSION}-coincidence-False-False-english",
+        )
+        self.assertEqual(
+            crack_key(encrypted_text=test_letters, cache_dir=self.cache_dir),
+            [1, 2],
+            default_err_msg.format("crack_key"),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
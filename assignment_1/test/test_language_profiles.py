@@ -0,0 +1,67 @@
+import unittest
+import numpy as np
+from ciphers.language_profiles import (
+    LANGUAGE_LETTER_FREQUENCIES,
+    LANGUAGES,
+    detect_language,
+    score_languages,
+)
+from ciphers.vigenere import (
+    apply_key,
+    count_of_every_nth_letter_for_all_positions,
+    return_best_key,
+)
+
+default_err_msg = "{} has not returned correct output"
+rng = np.random.default_rng(seed=0)
+key = [3, 17, 5, 9]
+
+
+def sample_letters(language: str, size: int) -> np.ndarray:
+    letter_frequencies = LANGUAGE_LETTER_FREQUENCIES[language]
+    return rng.choice(
+        26, size=size, p=letter_frequencies / letter_frequencies.sum()
+    ).astype(np.uint8)
+
+
+class language_profiles_tester(unittest.TestCase):
+    def test_score_languages(self):
+        self.assertEqual(
+            score_languages(letter_counts=np.ones((4, 26))).shape,
+            (len(LANGUAGES),),
+            default_err_msg.format("score_languages"),
+        )
+
+    def test_detect_language(self):
+        for language in LANGUAGES:
+            with self.subTest(language=language):
+                self.assertEqual(
+                    detect_language(
+                        letter_counts=count_of_every_nth_letter_for_all_positions(
+                            encrypted_text=apply_key(
+                                text=sample_letters(language=language, size=2000),
+                                key=key,
+                                mode=1,
+                            ),
+                            n=len(key),
+                        )
+                    ),
+                    language,
+                    default_err_msg.format("detect_language"),
+                )
+
+    def test_return_best_key_with_detected_language(self):
+        self.assertEqual(
+            return_best_key(
+                encrypted_text=apply_key(
+                    text=sample_letters(language="german", size=2000), key=key, mode=1
+                ),
+                language="auto",
+            ),
+            key,
+            default_err_msg.format("return_best_key"),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
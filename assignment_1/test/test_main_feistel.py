@@ -1,9 +1,11 @@
 ﻿import unittest
 import os
 import sys
+import tempfile
 
 sys.path.append(os.path.join(os.path.dirname(os.path.dirname(__file__)), "main.py"))
 from main import main
+from ciphers.feistel import BLOCK_MODES, text_to_bytes
 from ciphers.utils import file_handler, output_for_file
 
 root_directory = os.getcwd()
@@ -225,6 +227,227 @@ class feistel_main_tester(unittest.TestCase):
             ],
         )
 
+    def test_main_encode_feistel_non_latin_1(self):
+        with tempfile.TemporaryDirectory() as output_directory:
+            input_path = os.path.join(output_directory, "input.txt")
+            output_path = os.path.join(output_directory, "output.txt")
+            file_handler(
+                path=input_path,
+                mode="w",
+                func=lambda f: f.write("It\u2019s Hello"),
+            )
+            with self.assertWarns(Warning):
+                main(
+                    args=[
+                        "--ifile",
+                        input_path,
+                        "--ofile",
+                        output_path,
+                        "--cipher",
+                        "feistel",
+                        "--decode",
+                        False,
+                        "--key",
+                        os.path.join(root_directory, "test/sample_text/key.txt"),
+                    ]
+                )
+            encoded_text = file_handler(
+                path=output_path, mode="r", func=lambda f: f.read()
+            )
+        self.assertIn(
+            "-----BEGIN ENCODED TEXT-----",
+            encoded_text,
+            default_err_msg.format("main_encode_feistel_non_latin_1"),
+        )
+
+        self.assertRaises(
+            ValueError,
+            main,
+            args=[
+                "--ifile",
+                os.path.join(
+                    root_directory,
+                    "test/sample_text/feistel_decoded_text_for_test.txt",
+                ),
+                "--ofile",
+                os.path.join(
+                    root_directory, "test/sample_text/feistel_encoded_text.txt"
+                ),
+                "--cipher",
+                "feistel",
+                "--decode",
+                False,
+                "--key",
+                os.path.join(root_directory, "test/sample_text/key.txt"),
+                "--block_mode",
+                "cbc",
+            ],
+        )
+
+    def test_main_invalid_block_size(self):
+        self.assertRaises(
+            ValueError,
+            main,
+            args=[
+                "--ifile",
+                os.path.join(
+                    root_directory,
+                    "test/sample_text/feistel_decoded_text_for_test.txt",
+                ),
+                "--ofile",
+                os.path.join(
+                    root_directory, "test/sample_text/feistel_encoded_text.txt"
+                ),
+                "--cipher",
+                "feistel",
+                "--decode",
+                False,
+                "--key",
+                os.path.join(root_directory, "test/sample_text/key.txt"),
+                "--block_mode",
+                "ecb",
+                "--block_size",
+                "96",
+            ],
+        )
+
+    def test_main_encode_feistel_streaming(self):
+        with tempfile.TemporaryDirectory() as output_directory:
+            output_paths = [
+                os.path.join(output_directory, file_name)
+                for file_name in ("whole.txt", "streamed.txt")
+            ]
+            for output_path, stream_args in zip(
+                output_paths, ([], ["--chunk_size", "3"])
+            ):
+                main(
+                    args=[
+                        "--ifile",
+                        os.path.join(
+                            root_directory,
+                            "test/sample_text/feistel_decoded_text_for_test.txt",
+                        ),
+                        "--ofile",
+                        output_path,
+                        "--cipher",
+                        "feistel",
+                        "--decode",
+                        False,
+                        "--key",
+                        os.path.join(root_directory, "test/sample_text/key.txt"),
+                        "--block_mode",
+                        "ecb",
+                    ]
+                    + stream_args
+                )
+            encoded_texts = [
+                file_handler(path=output_path, mode="r", func=lambda f: f.read())
+                for output_path in output_paths
+            ]
+        self.assertEqual(
+            encoded_texts[1],
+            encoded_texts[0],
+            default_err_msg.format("main_encode_feistel_streaming"),
+        )
+
+    def test_main_encode_decode_feistel_block_mode(self):
+        plaintext_path = os.path.join(
+            root_directory, "test/performance_test/plaintext/10000_words_plaintext.txt"
+        )
+        plaintext = (
+            text_to_bytes(
+                file_handler(
+                    path=plaintext_path, mode="r", func=lambda f: f.read(), newline=""
+                )
+            )
+            .tobytes()
+            .decode("latin-1")
+        )
+        for block_mode in BLOCK_MODES:
+            for stream_args in ([], ["--chunk_size", "1000"]):
+                with tempfile.TemporaryDirectory() as output_directory:
+                    paths = {
+                        name: os.path.join(output_directory, f"{name}.txt")
+                        for name in ("encoded", "ciphertext", "decoded")
+                    }
+                    for input_path, output_path, decode in (
+                        (plaintext_path, paths["encoded"], "False"),
+                        (paths["ciphertext"], paths["decoded"], "True"),
+                    ):
+                        main(
+                            args=[
+                                "--ifile",
+                                input_path,
+                                "--ofile",
+                                output_path,
+                                "--cipher",
+                                "feistel",
+                                "--decode",
+                                decode,
+                                "--key",
+                                os.path.join(
+                                    root_directory, "test/sample_text/key.txt"
+                                ),
+                                "--block_mode",
+                                block_mode,
+                            ]
+                            + stream_args
+                        )
+                        if decode == "False":
+                            ciphertext = self.text_between_armor(
+                                path=paths["encoded"], mode="ENCODED"
+                            )
+                            file_handler(
+                                path=paths["ciphertext"],
+                                mode="w",
+                                func=lambda f: f.write(ciphertext),
+                                newline="",
+                            )
+                    decoded_text = self.text_between_armor(
+                        path=paths["decoded"], mode="DECODED"
+                    )
+                self.assertEqual(
+                    decoded_text,
+                    plaintext,
+                    default_err_msg.format(
+                        f"main_encode_decode_feistel {block_mode} {stream_args}"
+                    ),
+                )
+
+    def text_between_armor(self, path: str, mode: str) -> str:
+        output = file_handler(path=path, mode="r", func=lambda f: f.read(), newline="")
+        return output[
+            output.index(f"-----BEGIN {mode} TEXT-----\n")
+            + len(f"-----BEGIN {mode} TEXT-----\n") : output.rindex(
+                f"\n-----END {mode} TEXT-----"
+            )
+        ]
+
+    def test_main_streaming_without_block_mode_raises_error(self):
+        self.assertRaises(
+            ValueError,
+            main,
+            args=[
+                "--ifile",
+                os.path.join(
+                    root_directory,
+                    "test/sample_text/feistel_decoded_text_for_test.txt",
+                ),
+                "--ofile",
+                os.path.join(
+                    root_directory, "test/sample_text/feistel_encoded_text.txt"
+                ),
+                "--cipher",
+                "feistel",
+                "--decode",
+                False,
+                "--key",
+                os.path.join(root_directory, "test/sample_text/key.txt"),
+                "--chunk_size",
+                "3",
+            ],
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
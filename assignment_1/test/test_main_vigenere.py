@@ -2,6 +2,7 @@ from base64 import encode
 import unittest
 import os
 import sys
+import tempfile
 
 sys.path.append(os.path.join(os.path.dirname(os.path.dirname(__file__)), "main.py"))
 from main import main
@@ -113,6 +114,268 @@ class vigenere_main_tester(unittest.TestCase):
             default_err_msg.format("main_decode_unknown_key_vigenere"),
         )
 
+    def test_main_decode_known_key_vigenere_streaming(self):
+        main(
+            args=[
+                "--ifile",
+                os.path.join(
+                    root_directory,
+                    "test/sample_text/vigenere_encoded_text_for_test.txt",
+                ),
+                "--ofile",
+                os.path.join(
+                    root_directory, "test/sample_text/vigenere_decoded_text.txt"
+                ),
+                "--cipher",
+                "vigenere",
+                "--key",
+                os.path.join(root_directory, "test/sample_text/key.txt"),
+                "--chunk_size",
+                "7",
+            ]
+        )
+        decoded_text = file_handler(
+            path=os.path.join(
+                root_directory, "test/sample_text/vigenere_decoded_text.txt"
+            ),
+            mode="r",
+            func=lambda f: f.read(),
+        )
+        self.assertEqual(
+            decoded_text,
+            test_decoded_output_file,
+            default_err_msg.format("main_decode_known_key_vigenere_streaming"),
+        )
+
+    def test_main_decode_unknown_key_vigenere_memory_map(self):
+        main(
+            args=[
+                "--ifile",
+                os.path.join(
+                    root_directory,
+                    "test/sample_text/vigenere_encoded_text_for_test.txt",
+                ),
+                "--ofile",
+                os.path.join(
+                    root_directory, "test/sample_text/vigenere_decoded_text.txt"
+                ),
+                "--cipher",
+                "vigenere",
+                "--memory_map",
+                "True",
+            ]
+        )
+        decoded_text = file_handler(
+            path=os.path.join(
+                root_directory, "test/sample_text/vigenere_decoded_text.txt"
+            ),
+            mode="r",
+            func=lambda f: f.read(),
+        )
+        self.assertEqual(
+            decoded_text,
+            test_decoded_output_file,
+            default_err_msg.format("main_decode_unknown_key_vigenere_memory_map"),
+        )
+
+    def test_main_decode_unknown_key_vigenere_memory_map_without_letters(self):
+        with tempfile.TemporaryDirectory() as directory:
+            ifile = os.path.join(directory, "input.txt")
+            ofile = os.path.join(directory, "output.txt")
+            for text in ("", "!!! 123"):
+                file_handler(path=ifile, mode="w", func=lambda f: f.write(text))
+                main(args=["--ifile", ifile, "--ofile", ofile, "--memory_map", "True"])
+                decoded_text = file_handler(
+                    path=ofile, mode="r", func=lambda f: f.read()
+                )
+                with self.subTest(default_err_msg.format("main_memory_map no letters")):
+                    self.assertEqual(
+                        decoded_text,
+                        output_for_file.format(
+                            cipher="VIGENERE", key="", mode="DECODED", text=text
+                        ),
+                    )
+
+    def test_main_decode_unknown_key_vigenere_ioc(self):
+        main(
+            args=[
+                "--ifile",
+                os.path.join(
+                    root_directory,
+                    "test/sample_text/vigenere_encoded_text_for_test.txt",
+                ),
+                "--ofile",
+                os.path.join(
+                    root_directory, "test/sample_text/vigenere_decoded_text.txt"
+                ),
+                "--cipher",
+                "vigenere",
+                "--key_length_engine",
+                "ioc",
+            ]
+        )
+        decoded_text = file_handler(
+            path=os.path.join(
+                root_directory, "test/sample_text/vigenere_decoded_text.txt"
+            ),
+            mode="r",
+            func=lambda f: f.read(),
+        )
+        self.assertEqual(
+            decoded_text,
+            test_decoded_output_file,
+            default_err_msg.format("main_decode_unknown_key_vigenere_ioc"),
+        )
+
+    def test_main_invalid_key_length_engine_raises_error(self):
+        self.assertRaises(
+            ValueError,
+            main,
+            args=[
+                "--ifile",
+                os.path.join(
+                    root_directory,
+                    "test/sample_text/vigenere_encoded_text_for_test.txt",
+                ),
+                "--cipher",
+                "vigenere",
+                "--key_length_engine",
+                "kasiski",
+            ],
+        )
+
+    def test_main_decode_unknown_key_vigenere_top_k(self):
+        with tempfile.TemporaryDirectory() as output_directory:
+            output_path = os.path.join(output_directory, "decoded_text.txt")
+            main(
+                args=[
+                    "--ifile",
+                    os.path.join(
+                        root_directory,
+                        "test/sample_text/vigenere_encoded_text_for_test.txt",
+                    ),
+                    "--ofile",
+                    output_path,
+                    "--cipher",
+                    "vigenere",
+                    "--top_k",
+                    "2",
+                ]
+            )
+            decoded_text = file_handler(
+                path=output_path, mode="r", func=lambda f: f.read()
+            )
+        self.assertTrue(
+            decoded_text.startswith(test_decoded_output_file),
+            default_err_msg.format("main_decode_unknown_key_vigenere_top_k"),
+        )
+        self.assertIn(
+            "-----BEGIN VIGENERE KEY CANDIDATES-----\n1. KEY length=3",
+            decoded_text,
+            default_err_msg.format("main_decode_unknown_key_vigenere_top_k"),
+        )
+        self.assertIn(
+            "\n2. KKXKM length=5",
+            decoded_text,
+            default_err_msg.format("main_decode_unknown_key_vigenere_top_k"),
+        )
+
+    def test_main_top_k_with_key_raises_error(self):
+        self.assertRaises(
+            ValueError,
+            main,
+            args=[
+                "--ifile",
+                os.path.join(
+                    root_directory,
+                    "test/sample_text/vigenere_encoded_text_for_test.txt",
+                ),
+                "--cipher",
+                "vigenere",
+                "--key",
+                os.path.join(root_directory, "test/sample_text/key.txt"),
+                "--top_k",
+                "2",
+            ],
+        )
+
+    def test_main_top_k_with_refine_or_cache_raises_error(self):
+        for extra_args in (
+            ["--refine", "True"],
+            ["--cache_dir", tempfile.gettempdir()],
+            ["--cache_size", "2"],
+        ):
+            self.assertRaises(
+                ValueError,
+                main,
+                args=[
+                    "--ifile",
+                    os.path.join(
+                        root_directory,
+                        "test/sample_text/vigenere_encoded_text_for_test.txt",
+                    ),
+                    "--cipher",
+                    "vigenere",
+                    "--top_k",
+                    "3",
+                ]
+                + extra_args,
+            )
+
+    def test_main_invalid_language_raises_error(self):
+        self.assertRaises(
+            ValueError,
+            main,
+            args=[
+                "--ifile",
+                os.path.join(
+                    root_directory,
+                    "test/sample_text/vigenere_encoded_text_for_test.txt",
+                ),
+                "--cipher",
+                "vigenere",
+                "--language",
+                "klingon",
+            ],
+        )
+
+    def test_main_refine_non_english_raises_error(self):
+        for language in ("french", "auto"):
+            self.assertRaises(
+                ValueError,
+                main,
+                args=[
+                    "--ifile",
+                    os.path.join(
+                        root_directory,
+                        "test/sample_text/vigenere_encoded_text_for_test.txt",
+                    ),
+                    "--cipher",
+                    "vigenere",
+                    "--refine",
+                    "True",
+                    "--language",
+                    language,
+                ],
+            )
+
+    def test_main_streaming_without_key_raises_error(self):
+        self.assertRaises(
+            ValueError,
+            main,
+            args=[
+                "--ifile",
+                os.path.join(
+                    root_directory,
+                    "test/sample_text/vigenere_encoded_text_for_test.txt",
+                ),
+                "--cipher",
+                "vigenere",
+                "--chunk_size",
+                "7",
+            ],
+        )
+
     def test_main_encode_decode_vigenere_non_ascii(self):
         with self.assertWarns(Warning):
             main(
@@ -183,6 +446,29 @@ class vigenere_main_tester(unittest.TestCase):
             ],
         )
 
+    def test_main_key_without_letters_raises_error(self):
+        with tempfile.TemporaryDirectory() as directory:
+            key_path = os.path.join(directory, "key.txt")
+            file_handler(path=key_path, mode="w", func=lambda f: f.write("123"))
+            for streaming_args in ([], ["--chunk_size", "7"]):
+                with self.subTest(default_err_msg.format("main key without letters")):
+                    self.assertRaises(
+                        ValueError,
+                        main,
+                        args=[
+                            "--ifile",
+                            os.path.join(
+                                root_directory,
+                                "test/sample_text/vigenere_encoded_text_for_test.txt",
+                            ),
+                            "--ofile",
+                            os.path.join(directory, "output.txt"),
+                            "--key",
+                            key_path,
+                        ]
+                        + streaming_args,
+                    )
+
     def test_main_invalid_cipher(self):
         self.assertRaises(
             ValueError,
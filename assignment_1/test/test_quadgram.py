@@ -0,0 +1,89 @@
+import os
+import unittest
+import numpy as np
+from ciphers.quadgram import (
+    build_quadgram_table,
+    quadgram_fitness,
+    quadgram_indices,
+    refine_key,
+)
+from ciphers.utils import file_handler
+from ciphers.vigenere import apply_key, normalize_text, return_best_key
+
+default_err_msg = "{} has not returned correct output"
+root_directory = os.getcwd()
+# held out from QUADGRAM_CORPUS_PATHS so refining is tested on unseen text
+test_letters = normalize_text(
+    file_handler(
+        path=os.path.join(
+            root_directory, "test/performance_test/plaintext/10000_words_plaintext.txt"
+        ),
+        mode="r",
+        func=lambda f: f.read(),
+    )
+)[0]
+
+
+class quadgram_tester(unittest.TestCase):
+    def test_quadgram_indices(self):
+        self.assertEqual(
+            quadgram_indices(np.array([0, 1, 2, 3, 25], dtype=np.uint8)).tolist(),
+            [1 * 26**2 + 2 * 26 + 3, (1 * 26**2 + 2 * 26 + 3) * 26 + 25],
+            default_err_msg.format("quadgram_indices"),
+        )
+
+    def test_build_quadgram_table(self):
+        table = build_quadgram_table("abcd abcd, bcde!")
+        self.assertEqual(
+            table.shape, (26**4,), default_err_msg.format("build_quadgram_table")
+        )
+        self.assertAlmostEqual(
+            float(table[quadgram_indices(np.array([0, 1, 2, 3]))[0]]),
+            float(np.log10(2 / 9)),
+            places=5,
+            msg=default_err_msg.format("build_quadgram_table"),
+        )
+
+    def test_quadgram_fitness(self):
+        english = test_letters[:400]
+        self.assertGreater(
+            quadgram_fitness(english),
+            quadgram_fitness(apply_key(text=english, key=[3], mode=1)),
+            default_err_msg.format("quadgram_fitness"),
+        )
+        batch = np.stack((english, english[::-1]))
+        self.assertTrue(
+            np.allclose(
+                quadgram_fitness(batch),
+                [quadgram_fitness(english), quadgram_fitness(english[::-1])],
+            ),
+            default_err_msg.format("quadgram_fitness"),
+        )
+
+    def test_refine_key(self):
+        key = [10, 4, 24, 7, 19, 2]
+        encrypted_text = apply_key(text=test_letters[5000:5060], key=key, mode=1)
+        self.assertNotEqual(
+            return_best_key(encrypted_text=encrypted_text),
+            key,
+            default_err_msg.format("return_best_key"),
+        )
+        self.assertEqual(
+            return_best_key(encrypted_text=encrypted_text, refine=True),
+            key,
+            default_err_msg.format("refine_key"),
+        )
+        wrong_key = [10, 5, 24]
+        self.assertEqual(
+            refine_key(
+                encrypted_text=apply_key(text=test_letters, key=[10, 4, 24], mode=1),
+                key=wrong_key,
+            ),
+            [10, 4, 24],
+            default_err_msg.format("refine_key"),
+        )
+        self.assertEqual(wrong_key, [10, 4, 24], default_err_msg.format("refine_key"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,22 +2,40 @@ from typing import Callable, Dict
 import unittest
 import numpy as np
 import os
-from ciphers.utils import file_handler, output_for_file
+import tempfile
+from unittest import mock
+from unidecode import unidecode
+from ciphers.utils import file_handler, output_for_file, transliterate_character
 from ciphers.vigenere import (
     convert_text_to_position_in_alphabet,
+    normalize_text,
     count_shifted_coincidences,
     key_length_counter,
     return_best_key,
     count_of_every_nth_letter,
+    count_of_every_nth_letter_for_all_positions,
     frequency_of_every_nth_letter,
     find_letter_in_key,
     find_possible_key,
     return_best_key,
     restore_punctuation_to_string,
+    collapse_whitespace,
+    stream_vigenere_coding,
     apply_key_while_restoring_to_letters,
     return_sorted_possible_key_lengths,
     replace_non_ascii_with_alike_char,
+    key_confidence,
     prune_possible_keys,
+    return_top_key_candidates,
+    return_best_key_and_score,
+    vigenere_main,
+    average_index_of_coincidence,
+    sort_key_lengths_by_index_of_coincidence,
+    find_converged_sample_size,
+    apply_key,
+    calculate_chi_squared,
+    return_solution_for_key,
+    read_letters_from_file,
 )
 
 brown_fox_text = "The quick brown fox \njumps over the lazy dog!"
@@ -347,6 +365,21 @@ test_encoded_text = file_handler(
     func=lambda f: f.read(),
 )
 
+long_test_text_encrypted = apply_key(
+    text=convert_text_to_position_in_alphabet(
+        text=file_handler(
+            path=os.path.join(
+                root_directory,
+                "test/performance_test/plaintext/10000_words_plaintext.txt",
+            ),
+            mode="r",
+            func=lambda f: f.read(),
+        )
+    ),
+    key=[10, 4, 24],
+    mode=1,
+)
+
 
 class vigenere_tester(unittest.TestCase):
     def numpy_array_equality_tester(
@@ -379,6 +412,35 @@ class vigenere_tester(unittest.TestCase):
             err_message="Text has not converted correctly for brown fox example",
         )
 
+    def test_text_is_converted_to_one_dtype(self):
+        for text in ("Hello", "H\u00e8llo \u4e2d"):
+            with self.subTest(default_err_msg.format("Text conversion dtype")):
+                self.assertEqual(
+                    convert_text_to_position_in_alphabet(text=text).dtype, np.uint8
+                )
+        self.numpy_array_equality_tester(
+            func=convert_text_to_position_in_alphabet,
+            func_kwargs={"text": "H\u00e8llo!"},
+            expected_array=np.array([7, 4, 11, 11, 14]),
+            err_message="Text has not converted correctly for non-ASCII example",
+        )
+
+    def test_normalize_text(self):
+        letters, letter_mask = normalize_text(text="Ab, c!")
+
+        self.numpy_array_equality_tester(
+            func=lambda: letters,
+            func_kwargs={},
+            expected_array=np.array([0, 1, 2]),
+            err_message=default_err_msg.format("Normalize text letters"),
+        )
+        self.numpy_array_equality_tester(
+            func=lambda: letter_mask,
+            func_kwargs={},
+            expected_array=np.array([True, True, False, False, True, False]),
+            err_message=default_err_msg.format("Normalize text letter mask"),
+        )
+
     def test_count_shifted_coincidences(self):
         self.numpy_array_equality_tester(
             func=count_shifted_coincidences,
@@ -447,6 +509,24 @@ class vigenere_tester(unittest.TestCase):
             err_message=default_err_msg.format("Count of every nth letter"),
         )
 
+    def test_count_of_every_nth_letter_for_all_positions(self):
+        encrypted_text = convert_text_to_position_in_alphabet(text="ABAABCCACBBC")
+        self.numpy_array_equality_tester(
+            func=count_of_every_nth_letter_for_all_positions,
+            func_kwargs={"encrypted_text": encrypted_text, "n": 4},
+            expected_array=np.array(
+                [
+                    count_of_every_nth_letter(
+                        encrypted_text=encrypted_text, n=4, start_index=pos
+                    )
+                    for pos in range(4)
+                ]
+            ),
+            err_message=default_err_msg.format(
+                "Count of every nth letter for all positions"
+            ),
+        )
+
     def test_frequency_of_every_nth_letter(self):
         self.numpy_array_equality_tester(
             func=frequency_of_every_nth_letter,
@@ -532,6 +612,28 @@ class vigenere_tester(unittest.TestCase):
             default_err_msg.format("Prune possible keys"),
         )
 
+    def test_prune_possible_keys_with_limits(self):
+        sorted_key_lengths = [3, 4, 6, 8, 12, 5, 7]
+        self.assertEqual(
+            prune_possible_keys(
+                sorted_key_lengths=sorted_key_lengths, max_key_length=6
+            ),
+            [3, 4, 5],
+            default_err_msg.format("Prune possible keys"),
+        )
+        self.assertEqual(
+            prune_possible_keys(
+                sorted_key_lengths=sorted_key_lengths, max_candidates=2
+            ),
+            [3, 4],
+            default_err_msg.format("Prune possible keys"),
+        )
+        self.assertEqual(
+            sorted_key_lengths,
+            [3, 4, 6, 8, 12, 5, 7],
+            default_err_msg.format("Prune possible keys"),
+        )
+
     def test_return_best_key(self):
         key = return_best_key(
             encrypted_text=convert_text_to_position_in_alphabet(
@@ -540,6 +642,107 @@ class vigenere_tester(unittest.TestCase):
         )
         self.assertEqual(key, [10, 4, 24], default_err_msg.format("Return best key"))
 
+    def test_key_confidence(self):
+        self.assertEqual(
+            key_confidence(shift_scores=np.array([[0.5, 1.0, 0.25], [0.0, 0.0, 0.0]])),
+            [0.5, 0.0],
+            default_err_msg.format("Key confidence"),
+        )
+
+    def test_return_top_key_candidates(self):
+        encrypted_text = convert_text_to_position_in_alphabet(
+            text=test_phrase_encrypted
+        )
+        key_candidates = return_top_key_candidates(
+            encrypted_text=encrypted_text, top_k=2
+        )
+        self.assertEqual(
+            [candidate.key for candidate in key_candidates],
+            [[10, 4, 24], [10, 10, 23, 10, 12]],
+            default_err_msg.format("Return top key candidates"),
+        )
+        self.assertEqual(
+            key_candidates[0].key_length, 3, default_err_msg.format("Key length")
+        )
+        self.assertAlmostEqual(
+            key_candidates[0].chi_squared,
+            calculate_chi_squared(
+                sentence=return_solution_for_key(
+                    key=[10, 4, 24], encrypted_text=encrypted_text
+                )
+            ),
+            msg=default_err_msg.format("Return top key candidates chi squared"),
+        )
+        self.assertEqual(
+            len(key_candidates[0].confidence),
+            3,
+            default_err_msg.format("Return top key candidates confidence"),
+        )
+
+    def test_average_index_of_coincidence(self):
+        self.numpy_array_equality_tester(
+            func=average_index_of_coincidence,
+            func_kwargs={
+                "encrypted_text": convert_text_to_position_in_alphabet(
+                    text="ABAB" * 10
+                ),
+                "max_key_length": 2,
+            },
+            expected_array=np.array([0.4871, 1.0]),
+            err_message=default_err_msg.format("Average index of coincidence"),
+        )
+
+    def test_sort_key_lengths_by_index_of_coincidence(self):
+        self.assertEqual(
+            sort_key_lengths_by_index_of_coincidence(
+                index_of_coincidence=np.array([0.04, 0.045, 0.066, 0.05, 0.041, 0.068])
+            ),
+            [3, 6, 4, 2, 5, 1],
+            default_err_msg.format("Sort key lengths by index of coincidence"),
+        )
+
+    def test_return_best_key_index_of_coincidence(self):
+        key = return_best_key(
+            encrypted_text=convert_text_to_position_in_alphabet(
+                text=test_phrase_encrypted
+            ),
+            key_length_engine="ioc",
+        )
+        self.assertEqual(
+            key, [10, 4, 24], default_err_msg.format("Return best key with ioc")
+        )
+
+    def test_find_converged_sample_size(self):
+        self.assertEqual(
+            find_converged_sample_size(
+                encrypted_text=long_test_text_encrypted,
+                key_length_engine="ioc",
+                initial_sample_size=1000,
+            ),
+            2000,
+            default_err_msg.format("Find converged sample size"),
+        )
+
+    def test_return_best_key_progressive(self):
+        key = return_best_key(
+            encrypted_text=long_test_text_encrypted,
+            key_length_engine="ioc",
+            progressive=True,
+        )
+        self.assertEqual(
+            key, [10, 4, 24], default_err_msg.format("Return best key progressive")
+        )
+
+    def test_return_best_key_parallel(self):
+        key = return_best_key(
+            encrypted_text=long_test_text_encrypted,
+            key_length_engine="ioc",
+            workers=2,
+        )
+        self.assertEqual(
+            key, [10, 4, 24], default_err_msg.format("Return best key parallel")
+        )
+
     def test_solve_vigenere(self):
         key = return_best_key(
             encrypted_text=convert_text_to_position_in_alphabet(
@@ -555,7 +758,7 @@ class vigenere_tester(unittest.TestCase):
         )
         self.assertEqual(
             result,
-            test_phrase_as_list,
+            "".join(test_phrase_as_list),
             default_err_msg.format("apply_key_while_restoring_to_letters"),
         )
 
@@ -567,7 +770,7 @@ class vigenere_tester(unittest.TestCase):
         )
         self.assertEqual(
             result,
-            test_phrase_encrypted_as_list,
+            "".join(test_phrase_encrypted_as_list),
             default_err_msg.format("apply_key_while_restoring_to_letters"),
         )
 
@@ -581,6 +784,26 @@ class vigenere_tester(unittest.TestCase):
             default_err_msg.format("Restore punctuation to string"),
         )
 
+    def test_collapse_whitespace(self):
+        self.assertEqual(
+            collapse_whitespace(
+                np.frombuffer(b"\n The  quick\t\nfox. \n", dtype=np.uint8)
+            ).tobytes(),
+            b"\n The quick \n fox.",
+            default_err_msg.format("Collapse whitespace"),
+        )
+
+    def test_stream_vigenere_coding(self):
+        text_chunks = [
+            test_phrase_encrypted[pos : pos + 5]
+            for pos in range(0, len(test_phrase_encrypted), 5)
+        ]
+        self.assertEqual(
+            "".join(stream_vigenere_coding(text_chunks=text_chunks, key=[10, 4, 24])),
+            test_phrase,
+            default_err_msg.format("Stream vigenere coding"),
+        )
+
     def test_replace_non_ascii_with_alike_char(self):
         with self.assertWarns(Warning):
             result = replace_non_ascii_with_alike_char(text="Ceñía")
@@ -591,6 +814,62 @@ class vigenere_tester(unittest.TestCase):
             default_err_msg.format("Replace non ascii with alike char"),
         )
 
+    def test_replace_non_ascii_runs_with_alike_char(self):
+        text = "Ein Straßenfest in Zürich — «très» ünïcödé, 北京!" * 3
+        with self.assertWarns(Warning):
+            result = replace_non_ascii_with_alike_char(text=text)
+
+        self.assertEqual(
+            result,
+            unidecode(text),
+            default_err_msg.format("Replace non ascii with alike char"),
+        )
+        self.assertGreater(
+            transliterate_character.cache_info().hits,
+            0,
+            default_err_msg.format("Transliterate character"),
+        )
+
+    def test_read_letters_from_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "text.txt")
+            file_handler(path=path, mode="w", func=lambda f: f.write(""))
+            with self.subTest(default_err_msg.format("read_letters_from_file empty")):
+                self.assertEqual(read_letters_from_file(ifile=path).size, 0)
+
+            text = "Ab cd " * 10 + "H\u00e8llo"
+            file_handler(path=path, mode="w", func=lambda f: f.write(text), newline="")
+            with mock.patch(
+                "ciphers.vigenere.replace_non_ascii_with_alike_char",
+                wraps=replace_non_ascii_with_alike_char,
+            ) as replace_non_ascii:
+                letters = read_letters_from_file(ifile=path, chunk_size=12)
+            with self.subTest(default_err_msg.format("read_letters_from_file")):
+                np.testing.assert_equal(letters, normalize_text(unidecode(text))[0])
+            with self.subTest(default_err_msg.format("read_letters_from_file chunks")):
+                self.assertEqual(replace_non_ascii.call_count, 1)
+
+    def test_crack_text_without_letters(self):
+        with self.subTest(default_err_msg.format("return_best_key_and_score empty")):
+            self.assertEqual(
+                return_best_key_and_score(
+                    encrypted_text=np.zeros((0,), dtype=np.uint8)
+                ),
+                ([], float("inf")),
+            )
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "output.txt")
+            for text in ("", "!!! 123"):
+                vigenere_main(text=text, ofile=path)
+                with self.subTest(default_err_msg.format("vigenere_main no letters")):
+                    self.assertEqual(
+                        file_handler(path=path, mode="r", func=lambda f: f.read()),
+                        output_for_file.format(
+                            cipher="VIGENERE", key="", mode="DECODED", text=text
+                        ),
+                    )
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,136 @@
+import unittest
+import numpy as np
+import ciphers.vigenere as vigenere
+from ciphers.vigenere_batch import (
+    count_columns_of_stack,
+    count_shifted_coincidences_of_stack,
+    crack_many,
+    crack_messages,
+    normalize_messages,
+    sort_key_lengths_by_coincidence_gaps,
+    stack_messages,
+)
+from ciphers.vigenere import normalize_text
+from ciphers.vigenere_kernels import NUMBA_AVAILABLE
+
+default_err_msg = "{} has not returned correct output"
+test_phrase_encrypted = "Kx qozcxxcor ksrsdiq zeqd jmev gx xfo eddipxsmx, afspqd xfo tycwcxkcbw uovc kwqoqzvib kx jerar ml dlc qvckx qkpmyr, y cpgqlr clmmo ukw dopr yr rri fepj yj rri Qmsrse"
+
+
+class vigenere_batch_tester(unittest.TestCase):
+    def test_normalize_messages(self):
+        letters, letter_offsets = normalize_messages(ciphertexts=["Ab, c!", "", "d e"])
+        with self.subTest(default_err_msg.format("Normalize messages letters")):
+            np.testing.assert_equal(letters, np.array([0, 1, 2, 3, 4]))
+        with self.subTest(default_err_msg.format("Normalize messages offsets")):
+            np.testing.assert_equal(letter_offsets, np.array([0, 3, 3, 5]))
+
+    def test_crack_many(self):
+        result = crack_many(
+            ciphertexts=[test_phrase_encrypted, "", test_phrase_encrypted]
+        )
+        self.assertEqual(
+            result.keys,
+            [[10, 4, 24], [], [10, 4, 24]],
+            default_err_msg.format("Crack many"),
+        )
+        self.assertGreater(result.messages_per_second, 0)
+
+    def test_crack_many_parallel(self):
+        result = crack_many(ciphertexts=[test_phrase_encrypted] * 4, workers=2)
+        self.assertEqual(
+            result.keys,
+            [[10, 4, 24]] * 4,
+            default_err_msg.format("Crack many parallel"),
+        )
+
+    def test_stack_messages(self):
+        stack = stack_messages(
+            letters=np.array([0, 1, 2, 3, 4], dtype=np.uint8),
+            starts=np.array([0, 3]),
+            lengths=np.array([3, 2]),
+            width=4,
+        )
+        np.testing.assert_equal(stack, np.array([[0, 1, 2, 26], [3, 4, 26, 26]]))
+        letter_counts = count_columns_of_stack(stack=stack, key_length=2)
+        for row, (start, length) in enumerate([(0, 3), (3, 2)]):
+            with self.subTest(default_err_msg.format("count_columns_of_stack")):
+                np.testing.assert_equal(
+                    letter_counts[row],
+                    vigenere.count_of_every_nth_letter_for_all_positions(
+                        encrypted_text=np.arange(5)[start : start + length], n=2
+                    ),
+                )
+
+    def test_count_shifted_coincidences_of_stack(self):
+        rng = np.random.default_rng(seed=0)
+        previous_kernel_backend = vigenere.KERNEL_BACKEND
+        kernel_backends = ["numpy"] + ["numba"] * NUMBA_AVAILABLE
+        for width in (8, 1024):
+            lengths = np.array([width, width // 2 + 1, 1])
+            messages = [rng.integers(4, size=length) for length in lengths]
+            stack = stack_messages(
+                letters=np.concatenate(messages).astype(np.uint8),
+                starts=np.cumsum(lengths) - lengths,
+                lengths=lengths,
+                width=width,
+            )
+            for kernel_backend in kernel_backends:
+                vigenere.KERNEL_BACKEND = kernel_backend
+                coincidence_counts = count_shifted_coincidences_of_stack(
+                    stack=stack, lengths=lengths
+                )
+                vigenere.KERNEL_BACKEND = previous_kernel_backend
+                for message, coincidence_count in zip(messages, coincidence_counts):
+                    with self.subTest(
+                        default_err_msg.format(
+                            f"count_shifted_coincidences_of_stack {kernel_backend}"
+                        )
+                    ):
+                        np.testing.assert_equal(
+                            coincidence_count,
+                            vigenere.count_shifted_coincidences(message),
+                        )
+
+    def test_sort_key_lengths_by_coincidence_gaps(self):
+        coincidence_count = (
+            np.random.default_rng(seed=0).integers(12, size=200).astype(float)
+        )
+        self.assertEqual(
+            sort_key_lengths_by_coincidence_gaps(coincidence_count),
+            vigenere.sort_key_lengths(vigenere.key_length_counter(coincidence_count)),
+            default_err_msg.format("sort_key_lengths_by_coincidence_gaps"),
+        )
+
+    def test_crack_messages_matches_return_best_key_and_score(self):
+        letters = normalize_text(test_phrase_encrypted * 4)[0]
+        letter_offsets = [(0, 30), (5, 5), (10, 200), (0, 500), (3, 4)]
+        for key_length_engine in ("coincidence", "ioc"):
+            for language in ("english", "auto"):
+                results = crack_messages(
+                    letters=letters,
+                    letter_offsets=letter_offsets,
+                    key_length_engine=key_length_engine,
+                    language=language,
+                )
+                for (start, end), (key, chi_squared) in zip(letter_offsets, results):
+                    expected_key, expected_chi_squared = (
+                        vigenere.return_best_key_and_score(
+                            encrypted_text=letters[start:end],
+                            key_length_engine=key_length_engine,
+                            language=language,
+                        )
+                        if end > start
+                        else ([], float("inf"))
+                    )
+                    with self.subTest(
+                        default_err_msg.format(
+                            f"crack_messages {key_length_engine} {language}"
+                        )
+                    ):
+                        self.assertEqual(key, list(expected_key))
+                        self.assertAlmostEqual(chi_squared, expected_chi_squared)
+
+
+if __name__ == "__main__":
+    unittest.main()
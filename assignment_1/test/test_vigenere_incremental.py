@@ -0,0 +1,103 @@
+import os
+import unittest
+import numpy as np
+from ciphers.utils import file_handler
+from ciphers.vigenere import (
+    apply_key,
+    count_of_every_nth_letter_for_all_positions,
+    count_shifted_coincidences,
+    normalize_text,
+    score_key_length,
+)
+from ciphers.vigenere_incremental import IncrementalVigenereCracker
+
+default_err_msg = "{} has not returned correct output"
+root_directory = os.getcwd()
+test_key = [10, 4, 24, 7, 1]
+test_letters_encrypted = apply_key(
+    text=normalize_text(
+        file_handler(
+            path=os.path.join(
+                root_directory,
+                "test/performance_test/plaintext/10000_words_plaintext.txt",
+            ),
+            mode="r",
+            func=lambda f: f.read(),
+        )
+    )[0],
+    key=test_key,
+    mode=1,
+)
+test_phrase_encrypted = "Kx qozcxxcor ksrsdiq zeqd jmev gx xfo eddipxsmx, afspqd xfo tycwcxkcbw uovc kwqoqzvib kx jerar ml dlc qvckx qkpmyr, y cpgqlr clmmo ukw dopr yr rri fepj yj rri Qmsrse"
+
+
+def append_in_fragments(cracker: IncrementalVigenereCracker, letters: np.ndarray):
+    rng = np.random.default_rng(seed=0)
+    start = 0
+    while start < letters.size:
+        end = start + int(rng.integers(1, 3000))
+        cracker.append(letters[start:end])
+        start = end
+
+
+class vigenere_incremental_tester(unittest.TestCase):
+    def test_append_updates_statistics(self):
+        cracker = IncrementalVigenereCracker()
+        append_in_fragments(cracker=cracker, letters=test_letters_encrypted)
+        with self.subTest(default_err_msg.format("Incremental coincidence count")):
+            np.testing.assert_equal(
+                cracker.coincidence_count,
+                count_shifted_coincidences(encrypted_text=test_letters_encrypted)[
+                    : cracker.max_key_length
+                ],
+            )
+        for key_length in (1, 5, 13, cracker.max_key_length):
+            with self.subTest(default_err_msg.format("Incremental letter counts")):
+                np.testing.assert_equal(
+                    cracker.letter_counts(key_length),
+                    count_of_every_nth_letter_for_all_positions(
+                        encrypted_text=test_letters_encrypted, n=key_length
+                    ),
+                )
+
+    def test_best_key_and_score(self):
+        for key_length_engine in ("coincidence", "ioc"):
+            cracker = IncrementalVigenereCracker(key_length_engine=key_length_engine)
+            append_in_fragments(cracker=cracker, letters=test_letters_encrypted)
+            key, chi_squared_score = cracker.best_key_and_score()
+            with self.subTest(key_length_engine=key_length_engine):
+                self.assertEqual(
+                    key, test_key, default_err_msg.format("Incremental best key")
+                )
+                self.assertAlmostEqual(
+                    chi_squared_score,
+                    score_key_length(
+                        encrypted_text=test_letters_encrypted,
+                        key_length=len(test_key),
+                    )[1],
+                    msg=default_err_msg.format("Incremental chi squared"),
+                )
+
+    def test_append_text(self):
+        cracker = IncrementalVigenereCracker()
+        self.assertEqual(
+            cracker.best_key_and_score(),
+            ([], float("inf")),
+            default_err_msg.format("Incremental best key without letters"),
+        )
+        for word in test_phrase_encrypted.split(" "):
+            cracker.append_text(word + " ")
+        self.assertEqual(
+            cracker.best_key(),
+            [10, 4, 24],
+            default_err_msg.format("Incremental best key"),
+        )
+
+    def test_invalid_key_length_engine_raises_error(self):
+        self.assertRaises(
+            ValueError, IncrementalVigenereCracker, key_length_engine="kasiski"
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
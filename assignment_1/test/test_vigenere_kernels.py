@@ -0,0 +1,51 @@
+import unittest
+import numpy as np
+import ciphers.vigenere as vigenere
+import test.test_vigenere as vigenere_tests
+from ciphers.vigenere_kernels import NUMBA_AVAILABLE
+
+default_err_msg = "{} has not returned correct output"
+
+
+class vigenere_numpy_backend_tester(vigenere_tests.vigenere_tester):
+    kernel_backend = "numpy"
+
+    def setUp(self):
+        self.previous_kernel_backend = vigenere.KERNEL_BACKEND
+        vigenere.KERNEL_BACKEND = self.kernel_backend
+
+    def tearDown(self):
+        vigenere.KERNEL_BACKEND = self.previous_kernel_backend
+
+
+@unittest.skipUnless(NUMBA_AVAILABLE, "numba is not installed")
+class vigenere_numba_backend_tester(vigenere_numpy_backend_tester):
+    kernel_backend = "numba"
+
+    def test_kernels_match_numpy_backend(self):
+        rng = np.random.default_rng(seed=0)
+        encrypted_text = rng.integers(26, size=3000, dtype=np.uint8)
+        kernels = {
+            "count_shifted_coincidences": lambda: vigenere.count_shifted_coincidences(
+                encrypted_text=encrypted_text
+            ),
+            "count_of_every_nth_letter_for_all_positions": lambda: (
+                vigenere.count_of_every_nth_letter_for_all_positions(
+                    encrypted_text=encrypted_text, n=7
+                )
+            ),
+            "apply_key": lambda: vigenere.apply_key(
+                text=encrypted_text, key=[10, 4, 24], mode=-1
+            ),
+        }
+        for name, kernel in kernels.items():
+            numba_result = kernel()
+            vigenere.KERNEL_BACKEND = "numpy"
+            numpy_result = kernel()
+            vigenere.KERNEL_BACKEND = self.kernel_backend
+            with self.subTest(default_err_msg.format(name)):
+                np.testing.assert_array_equal(numba_result, numpy_result)
+
+
+if __name__ == "__main__":
+    unittest.main()